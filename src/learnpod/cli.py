@@ -1,14 +1,12 @@
 """LearnPod CLI インターフェース"""
 
+import functools
 import os
-from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
 import click
 
-from learnpod.config import config
-from learnpod.pipeline.orchestrator import PipelineOrchestrator
 from learnpod.utils.logger import setup_logging
 
 
@@ -22,11 +20,49 @@ def _parse_speakers(speakers_str: str) -> Dict[str, str]:
     return speakers
 
 
+@functools.lru_cache(maxsize=16)
+def _parse_speakers_cached(speakers_str: str) -> Tuple[Tuple[str, str], ...]:
+    """スピーカー設定文字列を解析（同じ文字列の結果はキャッシュ）"""
+    for pair in speakers_str.split(","):
+        if pair.strip() and "=" not in pair:
+            raise ValueError(f"'名前=値' の形式ではありません: {pair.strip()}")
+    return tuple(_parse_speakers(speakers_str).items())
+
+
+class SpeakersParam(click.ParamType):
+    """スピーカー・音声設定（"Speaker 1=Sakura,Speaker 2=Taro"）を辞書に変換する引数型"""
+    
+    name = "speakers"
+    
+    def convert(self, value, param, ctx) -> Dict[str, str]:
+        if isinstance(value, dict):
+            return value
+        try:
+            return dict(_parse_speakers_cached(value))
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+SPEAKERS = SpeakersParam()
+
+
+def _prepare_output_dir() -> Path:
+    """出力ディレクトリを作成（同じ分に実行された他のコマンドとは別のディレクトリ）"""
+    from learnpod.config import config
+    
+    return config.get_output_dir()
+
+
 @click.group()
 @click.version_option(version="0.2.0")
 @click.option("--verbose", "-v", is_flag=True, help="詳細ログを表示")
-def main(verbose: bool) -> None:
+@click.option("--no-cache", is_flag=True, help="LLMレスポンスのキャッシュを使わずに生成")
+def main(verbose: bool, no_cache: bool) -> None:
     """LearnPod - 学習・研究アウトプットからポッドキャスト音声とQ&Aセットを自動生成"""
+    # 設定は初回アクセス時に読み込まれるため、それより前に環境変数で指定する
+    if no_cache:
+        os.environ["LEARNPOD_NO_CACHE"] = "1"
+    
     # ログレベルの設定
     log_level = "DEBUG" if verbose else "INFO"
     setup_logging(log_level)
@@ -38,11 +74,13 @@ def main(verbose: bool) -> None:
 @click.option("--lang", default="ja", help="言語設定")
 @click.option(
     "--speakers",
+    type=SPEAKERS,
     default="Speaker 1=Sakura,Speaker 2=Taro",
     help="スピーカー設定（例: Speaker 1=Sakura,Speaker 2=Taro）",
 )
 @click.option(
     "--voices",
+    type=SPEAKERS,
     default="Speaker 1=Zephyr,Speaker 2=Puck",
     help="音声設定（例: Speaker 1=Zephyr,Speaker 2=Puck）",
 )
@@ -52,17 +90,15 @@ def run(
     input_file: Path,
     length: int,
     lang: str,
-    speakers: str,
-    voices: str,
+    speakers: Dict[str, str],
+    voices: Dict[str, str],
     no_email: bool,
     run_all: bool,
 ) -> None:
     """Markdownファイルからポッドキャストコンテンツを生成"""
     
     try:
-        # 設定の解析
-        speaker_config = _parse_speakers(speakers)
-        voice_config = _parse_speakers(voices)
+        from learnpod.pipeline.orchestrator import PipelineOrchestrator
         
         # パイプラインの実行
         orchestrator = PipelineOrchestrator()
@@ -71,8 +107,8 @@ def run(
             input_file=input_file,
             language=lang,
             target_length=length,
-            speakers=speaker_config,
-            voice_map=voice_config,
+            speakers=speakers,
+            voice_map=voices,
             send_mail=not no_email,
         )
         
@@ -117,6 +153,7 @@ def ingest(input_file: Path) -> None:
 @click.option("--lang", default="ja", help="言語設定")
 @click.option(
     "--speakers",
+    type=SPEAKERS,
     default="Speaker 1=Sakura,Speaker 2=Taro",
     help="スピーカー設定",
 )
@@ -124,7 +161,7 @@ def script(
     input_file: Path,
     length: int,
     lang: str,
-    speakers: str,
+    speakers: Dict[str, str],
 ) -> None:
     """台本のみを生成"""
     
@@ -133,23 +170,18 @@ def script(
         from learnpod.pipeline.build_script import build_script
         
         # 出力ディレクトリの準備
-        timestamp = datetime.now().strftime("%y%m%d_%H%M")
-        output_dir = Path("outputs") / timestamp
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = _prepare_output_dir()
         
         # Markdown取り込み
         doc = ingest_markdown(input_file)
         
-        # スピーカー設定の解析
-        speaker_config = _parse_speakers(speakers)
-        
         # 台本生成
         script_path = build_script(
             doc=doc,
             output_dir=output_dir,
             language=lang,
             target_length=length,
-            speakers=speaker_config,
+            speakers=speakers,
         )
         
         click.echo(f"✅ 台本生成完了: {script_path}")
@@ -163,28 +195,24 @@ def script(
 @click.argument("script_file", type=click.Path(exists=True, path_type=Path))
 @click.option(
     "--voices",
+    type=SPEAKERS,
     default="Speaker 1=Zephyr,Speaker 2=Puck",
     help="音声設定",
 )
-def audio(script_file: Path, voices: str) -> None:
+def audio(script_file: Path, voices: Dict[str, str]) -> None:
     """台本から音声を生成"""
     
     try:
         from learnpod.pipeline.build_audio import build_audio
         
         # 出力ディレクトリの準備
-        timestamp = datetime.now().strftime("%y%m%d_%H%M")
-        output_dir = Path("outputs") / timestamp
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 音声設定の解析
-        voice_config = _parse_speakers(voices)
+        output_dir = _prepare_output_dir()
         
         # 音声生成
         audio_path = build_audio(
             script_path=script_file,
             output_dir=output_dir,
-            speaker_configs=voice_config,
+            speaker_configs=voices,
         )
         
         if audio_path:
@@ -207,9 +235,7 @@ def questions(script_file: Path) -> None:
         from learnpod.pipeline.build_questions import build_questions
         
         # 出力ディレクトリの準備
-        timestamp = datetime.now().strftime("%y%m%d_%H%M")
-        output_dir = Path("outputs") / timestamp
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = _prepare_output_dir()
         
         # Q&A生成
         qa_path, flashcard_path = build_questions(
@@ -229,12 +255,14 @@ def questions(script_file: Path) -> None:
 @main.command()
 def config_check() -> None:
     """設定を確認"""
+    from learnpod.config import config
     
     click.echo("🔧 LearnPod 設定確認")
     click.echo("=" * 30)
     
     # API設定
-    if config.gemini_api_key:
+    # 未設定でも例外にせず状態を表示する
+    if config._gemini_api_key:
         click.echo("✅ Gemini API Key: 設定済み")
     else:
         click.echo("❌ Gemini API Key: 未設定")
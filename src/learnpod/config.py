@@ -1,5 +1,6 @@
 """設定管理モジュール"""
 
+import functools
 import os
 from pathlib import Path
 from typing import Optional
@@ -17,15 +18,15 @@ class Config:
             if env_path.exists():
                 load_dotenv(env_path)
         
-        # Gemini API設定
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        if not self.gemini_api_key:
-            raise ValueError("GEMINI_API_KEY が設定されていません")
+        # Gemini API設定（未設定のチェックは使用時に行う）
+        self._gemini_api_key = os.getenv("GEMINI_API_KEY")
         
         # Gmail設定（オプション）
         self.gmail_user = os.getenv("GMAIL_USER")
         self.gmail_password = os.getenv("GMAIL_PASSWORD")
         self.gmail_to = os.getenv("GMAIL_TO")
+        # Gmail設定が完了しているか（プロセス内で不変のため初期化時に判定）
+        self.has_gmail_config = bool(self.gmail_user and self.gmail_password and self.gmail_to)
         
         # デフォルト設定
         self.default_language = "ja"
@@ -41,44 +42,77 @@ class Config:
         self.chunk_size = 800  # トークン数
         self.target_words = (2000, 3000)  # 台本の目標語数
         
+        # LLMレスポンスキャッシュ設定
+        cache_root = os.getenv("LEARNPOD_CACHE_DIR")
+        self.cache_dir = Path(cache_root) if cache_root else Path.home() / ".cache" / "learnpod"
+        self.llm_cache_dir = self.cache_dir / "llm"
+        self.llm_cache_ttl = 7 * 24 * 60 * 60  # 秒（7日間）
+        # LEARNPOD_NO_CACHE が設定されている場合はキャッシュを使わない（--no-cache）
+        self.llm_cache_enabled = not os.getenv("LEARNPOD_NO_CACHE")
+        
     @property
-    def has_gmail_config(self) -> bool:
-        """Gmail設定が完了しているかチェック"""
-        return all([self.gmail_user, self.gmail_password, self.gmail_to])
+    def gemini_api_key(self) -> str:
+        """
+        Gemini APIキーを取得
+        
+        Raises:
+            ValueError: GEMINI_API_KEY が設定されていない場合
+        """
+        if not self._gemini_api_key:
+            raise ValueError("GEMINI_API_KEY が設定されていません")
+        return self._gemini_api_key
     
     def get_output_dir(self, timestamp: Optional[str] = None) -> Path:
-        """出力ディレクトリのパスを取得"""
+        """
+        出力ディレクトリを作成してパスを取得
+        
+        存在確認と作成を別々に行わず、mkdirの成否で衝突を判定するため、
+        並行実行されたプロセス間でも同じディレクトリが選ばれることはない。
+        """
         if timestamp is None:
             from datetime import datetime
             timestamp = datetime.now().strftime("%y%m%d_%H%M")
         
-        base_dir = Path("outputs") / timestamp
+        original_dir = Path("outputs") / timestamp
+        original_dir.parent.mkdir(parents=True, exist_ok=True)
         
         # ディレクトリ衝突の回避
+        base_dir = original_dir
         counter = 1
-        original_dir = base_dir
-        while base_dir.exists():
-            base_dir = Path(f"{original_dir}_{counter}")
-            counter += 1
-            
-        return base_dir
+        while True:
+            try:
+                base_dir.mkdir()
+                return base_dir
+            except FileExistsError:
+                base_dir = Path(f"{original_dir}_{counter}")
+                counter += 1
+
+
+@functools.lru_cache(maxsize=1)
+def _get_config_singleton() -> Config:
+    """プロセス内で共有する設定インスタンスを取得（.envの解析は1回のみ）"""
+    return Config()
 
 
 class ConfigProxy:
     """設定プロキシクラス（遅延初期化）"""
     
-    def __init__(self):
-        self._config: Optional[Config] = None
-    
     def _get_config(self) -> Config:
         """設定インスタンスを取得（遅延初期化）"""
-        if self._config is None:
-            self._config = Config()
-        return self._config
+        return _get_config_singleton()
     
     def __getattr__(self, name):
-        """属性アクセスを設定インスタンスに委譲"""
-        return getattr(self._get_config(), name)
+        """
+        属性アクセスを設定インスタンスに委譲
+        
+        初回アクセス時に値をプロキシの__dict__へコピーし、
+        以降のアクセスでは__getattr__を経由しないようにする。
+        """
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = getattr(self._get_config(), name)
+        object.__setattr__(self, name, value)
+        return value
 
 
 # グローバル設定インスタンス（遅延初期化）
@@ -1,5 +1,5 @@
 """メール送信モジュール"""
 
-from .sender import send_email
+from .sender import SMTPSession, send_email
 
-__all__ = ["send_email"] 
\ No newline at end of file
+__all__ = ["SMTPSession", "send_email"]
\ No newline at end of file
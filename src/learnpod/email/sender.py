@@ -1,17 +1,127 @@
 """メール送信モジュール"""
 
+import io
+import mmap
+import re
 import smtplib
-from email.mime.application import MIMEApplication
+from email import encoders
+from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from learnpod.config import config
+from learnpod.utils.audio import get_audio_duration
 from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 添付ファイル種別ごとの説明
+_ATTACHMENT_LABELS = {
+    "audio": "音声ファイル",
+    "script": "台本",
+    "explanation": "詳細解説",
+    "questions": "Q&A",
+    "flashcards": "フラッシュカード",
+}
+
+# 添付ファイル種別ごとの本文の説明行
+_ATTACHMENT_LINES = {
+    "audio": "🎧 音声ファイル ({name}) - {meta}",
+    "script": "📝 台本 ({name}) - 約{meta}語",
+    "explanation": "📖 詳細解説 ({name}) - 約{meta}語",
+    "questions": "❓ Q&A ({name}) - {meta}問",
+    "flashcards": "🗂️ フラッシュカード ({name}) - {meta}枚",
+}
+
+# メール本文の末尾
+_EMAIL_FOOTER = """
+【使用方法】
+1. 音声ファイルを再生してポッドキャストを聞く
+2. 台本と詳細解説で理解を深める
+3. Q&Aで理解度をチェック
+4. フラッシュカードで重要用語を復習
+
+学習にお役立てください！
+
+---
+LearnPod v0.2.0
+https://github.com/your-repo/learnpod"""
+
+# 語数の概算で除外する空白文字（全角スペースを含む）
+_STRIP_WS = str.maketrans("", "", " \n\r\t\u3000")
+
+# Q&Aの問題番号（**Q1: 形式）
+_QA_RE = re.compile(r'\*\*Q\d+:')
+
+# フラッシュカードのブロック（行頭の "flashcards:" から次のトップレベルの行まで）
+_FLASHCARDS_KEY_RE = re.compile(r'^flashcards[ \t]*:[ \t]*$', re.MULTILINE)
+_TOP_LEVEL_LINE_RE = re.compile(r'^\S', re.MULTILINE)
+
+# プロンプトで指定した形式のフラッシュカードの要素（"  - id:" で始まる）と、リストの要素全般
+_FLASHCARD_ID_RE = re.compile(r'^  - id[ \t]*:', re.MULTILINE)
+_FLASHCARD_ENTRY_RE = re.compile(r'^  - ', re.MULTILINE)
+
+# Gmail SMTPサーバー
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+
+
+class SMTPSession:
+    """
+    複数回のメール送信で使い回すSMTP接続
+    
+    接続・TLSハンドシェイク・ログインを1回にまとめるため、
+    複数の送信をまとめて行う場合はwith文で開いたセッションをsend_emailに渡す。
+    """
+    
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT) -> None:
+        """
+        Args:
+            host: SMTPサーバーのホスト名
+            port: SMTPサーバーのポート番号
+        """
+        self.host = host
+        self.port = port
+        self.server: Optional[smtplib.SMTP_SSL] = None
+    
+    def __enter__(self) -> "SMTPSession":
+        self.server = smtplib.SMTP_SSL(self.host, self.port)
+        try:
+            self.server.login(config.gmail_user, config.gmail_password)
+        except Exception:
+            self.server.close()
+            self.server = None
+            raise
+        logger.debug(f"SMTPセッション開始: {self.host}:{self.port}")
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except smtplib.SMTPException:
+            self.server.close()
+        finally:
+            self.server = None
+            logger.debug("SMTPセッション終了")
+    
+    def send_message(self, msg: MIMEMultipart) -> None:
+        """
+        メッセージを送信
+        
+        Args:
+            msg: メールメッセージ
+            
+        Raises:
+            RuntimeError: セッションが開始されていない場合
+        """
+        if self.server is None:
+            raise RuntimeError("SMTPセッションが開始されていません")
+        self.server.send_message(msg)
+
 
 def send_email(
     output_dir: Path,
@@ -21,6 +131,7 @@ def send_email(
     explanation_path: Optional[Path] = None,
     qa_path: Optional[Path] = None,
     flashcard_path: Optional[Path] = None,
+    session: Optional[SMTPSession] = None,
 ) -> bool:
     """
     生成されたコンテンツをメールで送信
@@ -33,6 +144,7 @@ def send_email(
         explanation_path: 詳細解説ファイルのパス
         qa_path: Q&Aファイルのパス
         flashcard_path: フラッシュカードファイルのパス
+        session: 開始済みのSMTPセッション（Noneの場合は送信ごとに接続）
         
     Returns:
         送信成功時True
@@ -55,9 +167,11 @@ def send_email(
         )
         
         # SMTP接続とメール送信
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(config.gmail_user, config.gmail_password)
-            server.send_message(msg)
+        if session is not None:
+            session.send_message(msg)
+        else:
+            with SMTPSession() as new_session:
+                new_session.send_message(msg)
         
         logger.info("メール送信完了")
         return True
@@ -94,9 +208,8 @@ def _create_message(
     msg["To"] = config.gmail_to
     msg["Subject"] = f"LearnPod: {title}"
     
-    # メール本文の作成
-    body = _create_email_body(
-        title=title,
+    # 添付ファイルの存在確認と読み込み（各ファイル1回のみ）
+    file_info = _collect_file_info(
         audio_path=audio_path,
         script_path=script_path,
         explanation_path=explanation_path,
@@ -104,37 +217,31 @@ def _create_message(
         flashcard_path=flashcard_path,
     )
     
-    msg.attach(MIMEText(body, "plain", "utf-8"))
+    # メール本文の作成
+    body = _create_email_body(title=title, file_info=file_info)
     
-    # ファイルの添付
-    attachments = [
-        ("音声ファイル", audio_path),
-        ("台本", script_path),
-        ("詳細解説", explanation_path),
-        ("Q&A", qa_path),
-        ("フラッシュカード", flashcard_path),
-    ]
+    msg.attach(MIMEText(body, "plain", "utf-8"))
     
-    for description, file_path in attachments:
-        if file_path and file_path.exists():
-            _attach_file(msg, file_path, description)
+    # ファイルの添付（読み込み済みの内容を再利用）
+    for kind, (file_path, content) in file_info.items():
+        _attach_file(msg, file_path, _ATTACHMENT_LABELS[kind], content)
     
     return msg
 
 
-def _create_email_body(
-    title: str,
+def _collect_file_info(
     audio_path: Optional[Path] = None,
     script_path: Optional[Path] = None,
     explanation_path: Optional[Path] = None,
     qa_path: Optional[Path] = None,
     flashcard_path: Optional[Path] = None,
-) -> str:
+) -> Dict[str, Tuple[Path, Optional[bytes]]]:
     """
-    メール本文を作成
+    添付対象ファイルを1回ずつ確認し、テキストファイルの内容を読み込む
+    
+    音声ファイルはサイズが大きいため内容は読み込まず、添付時にmmapで扱う。
     
     Args:
-        title: ポッドキャストのタイトル
         audio_path: 音声ファイルのパス
         script_path: 台本ファイルのパス
         explanation_path: 詳細解説ファイルのパス
@@ -142,57 +249,100 @@ def _create_email_body(
         flashcard_path: フラッシュカードファイルのパス
         
     Returns:
-        メール本文
+        種別ごとの(ファイルパス, 内容)の辞書（存在しないファイルは含まない）
     """
-    body_parts = [
-        f"LearnPodで生成されたコンテンツをお送りします。",
-        f"",
-        f"タイトル: {title}",
-        f"生成日時: {_get_current_datetime()}",
-        f"",
-        f"【添付ファイル】",
-    ]
+    candidates = {
+        "audio": audio_path,
+        "script": script_path,
+        "explanation": explanation_path,
+        "questions": qa_path,
+        "flashcards": flashcard_path,
+    }
     
-    # 添付ファイルの説明
-    if audio_path and audio_path.exists():
-        duration = _get_audio_duration(audio_path)
-        body_parts.append(f"🎧 音声ファイル ({audio_path.name}) - {duration}")
+    file_info: Dict[str, Tuple[Path, Optional[bytes]]] = {}
+    for kind, file_path in candidates.items():
+        if file_path is None:
+            continue
+        
+        if kind == "audio":
+            if file_path.is_file():
+                file_info[kind] = (file_path, None)
+            continue
+        
+        try:
+            file_info[kind] = (file_path, file_path.read_bytes())
+        except OSError:
+            continue  # 存在しない・読めないファイルは添付しない
     
-    if script_path and script_path.exists():
-        word_count = _get_file_word_count(script_path)
-        body_parts.append(f"📝 台本 ({script_path.name}) - 約{word_count}語")
+    return file_info
+
+
+def _create_email_body(
+    title: str,
+    file_info: Dict[str, Tuple[Path, Optional[bytes]]],
+) -> str:
+    """
+    メール本文を作成
+    
+    Args:
+        title: ポッドキャストのタイトル
+        file_info: _collect_file_infoで収集した添付ファイル情報
+        
+    Returns:
+        メール本文
+    """
+    buffer = io.StringIO()
+    write = buffer.write
     
-    if explanation_path and explanation_path.exists():
-        word_count = _get_file_word_count(explanation_path)
-        body_parts.append(f"📖 詳細解説 ({explanation_path.name}) - 約{word_count}語")
+    write(
+        "LearnPodで生成されたコンテンツをお送りします。\n"
+        "\n"
+        f"タイトル: {title}\n"
+        f"生成日時: {_get_current_datetime()}\n"
+        "\n"
+        "【添付ファイル】\n"
+    )
     
-    if qa_path and qa_path.exists():
-        qa_count = _get_qa_count(qa_path)
-        body_parts.append(f"❓ Q&A ({qa_path.name}) - {qa_count}問")
+    # 添付ファイルの説明（file_infoは存在するファイルのみを含む）
+    for kind, (file_path, content) in file_info.items():
+        write(_ATTACHMENT_LINES[kind].format(
+            name=file_path.name,
+            meta=_describe_attachment(kind, file_path, content),
+        ))
+        write("\n")
     
-    if flashcard_path and flashcard_path.exists():
-        flashcard_count = _get_flashcard_count(flashcard_path)
-        body_parts.append(f"🗂️ フラッシュカード ({flashcard_path.name}) - {flashcard_count}枚")
+    write(_EMAIL_FOOTER)
     
-    body_parts.extend([
-        f"",
-        f"【使用方法】",
-        f"1. 音声ファイルを再生してポッドキャストを聞く",
-        f"2. 台本と詳細解説で理解を深める",
-        f"3. Q&Aで理解度をチェック",
-        f"4. フラッシュカードで重要用語を復習",
-        f"",
-        f"学習にお役立てください！",
-        f"",
-        f"---",
-        f"LearnPod v0.2.0",
-        f"https://github.com/your-repo/learnpod",
-    ])
+    return buffer.getvalue()
+
+
+def _describe_attachment(kind: str, file_path: Path, content: Optional[bytes]) -> str:
+    """
+    添付ファイルの概要（長さ・語数・件数）を取得
     
-    return "\n".join(body_parts)
+    Args:
+        kind: 添付ファイルの種別
+        file_path: ファイルのパス
+        content: 読み込み済みのファイル内容
+        
+    Returns:
+        本文に表示する概要
+    """
+    if kind == "audio":
+        return _get_audio_duration(file_path)
+    if kind == "questions":
+        return str(_get_qa_count(content))
+    if kind == "flashcards":
+        return str(_get_flashcard_count(content))
+    return str(_get_file_word_count(content))
 
 
-def _attach_file(msg: MIMEMultipart, file_path: Path, description: str) -> None:
+def _attach_file(
+    msg: MIMEMultipart,
+    file_path: Path,
+    description: str,
+    content: Optional[bytes] = None,
+) -> None:
     """
     ファイルをメールに添付
     
@@ -200,10 +350,24 @@ def _attach_file(msg: MIMEMultipart, file_path: Path, description: str) -> None:
         msg: メールメッセージ
         file_path: 添付ファイルのパス
         description: ファイルの説明
+        content: 読み込み済みのファイル内容（Noneの場合はファイルから読み込む）
     """
     try:
-        with open(file_path, "rb") as f:
-            attachment = MIMEApplication(f.read())
+        attachment = MIMEBase("application", "octet-stream")
+        
+        if content is not None:
+            attachment.set_payload(content)
+            encoders.encode_base64(attachment)
+        else:
+            with open(file_path, "rb") as f:
+                if file_path.stat().st_size > 0:
+                    # mmapを直接Base64エンコードし、ファイル全体のbytesコピーを作らない
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        attachment.set_payload(mapped)
+                        encoders.encode_base64(attachment)
+                else:
+                    attachment.set_payload(b"")
+                    encoders.encode_base64(attachment)
         
         attachment.add_header(
             "Content-Disposition",
@@ -226,46 +390,74 @@ def _get_current_datetime() -> str:
 
 def _get_audio_duration(audio_path: Path) -> str:
     """音声ファイルの長さを取得"""
-    try:
-        from pydub import AudioSegment
-        audio = AudioSegment.from_file(str(audio_path))
-        duration_seconds = len(audio) / 1000
-        minutes = int(duration_seconds // 60)
-        seconds = int(duration_seconds % 60)
-        return f"{minutes}分{seconds}秒"
-    except Exception:
+    duration_seconds = get_audio_duration(audio_path)
+    if duration_seconds is None:
         return "不明"
+    
+    minutes = int(duration_seconds // 60)
+    seconds = int(duration_seconds % 60)
+    return f"{minutes}分{seconds}秒"
 
 
-def _get_file_word_count(file_path: Path) -> int:
-    """ファイルの語数を取得（概算）"""
+def _get_file_word_count(data: bytes) -> int:
+    """ファイル内容の語数を取得（概算）"""
     try:
-        content = file_path.read_text(encoding="utf-8")
-        # 日本語の場合、文字数を語数として概算
-        return len(content.replace(" ", "").replace("\n", ""))
+        content = data.decode("utf-8")
+        # 日本語の場合、空白を除いた文字数を語数として概算（1パスで除去）
+        return len(content.translate(_STRIP_WS))
     except Exception:
         return 0
 
 
-def _get_qa_count(qa_path: Path) -> int:
+def _get_qa_count(data: bytes) -> int:
     """Q&Aの問題数を取得"""
     try:
-        content = qa_path.read_text(encoding="utf-8")
-        import re
-        matches = re.findall(r'\*\*Q\d+:', content)
-        return len(matches)
+        content = data.decode("utf-8")
+        # マッチのリストを作らずに件数のみ数える
+        return sum(1 for _ in _QA_RE.finditer(content))
     except Exception:
         return 0
 
 
-def _get_flashcard_count(flashcard_path: Path) -> int:
+def _get_flashcard_count(data: bytes) -> int:
     """フラッシュカードの枚数を取得"""
     try:
+        content = data.decode("utf-8")
+        
+        # YAML全体を解析せず、"flashcards:" ブロック直下の "  - id:" の行数で枚数を数える
+        count = _count_flashcard_ids(content)
+        if count > 0:
+            return count
+        
+        # yaml.dump の出力やフロー形式など、プロンプトと異なる形式の場合のみYAMLを解析
         import yaml
-        content = flashcard_path.read_text(encoding="utf-8")
-        data = yaml.safe_load(content)
-        if isinstance(data, dict) and "flashcards" in data:
-            return len(data["flashcards"])
+        parsed = yaml.safe_load(content)
+        if isinstance(parsed, dict) and "flashcards" in parsed:
+            return len(parsed["flashcards"])
         return 0
     except Exception:
-        return 0 
\ No newline at end of file
+        return 0 
+
+
+def _count_flashcard_ids(content: str) -> int:
+    """
+    "flashcards:" ブロック直下の "  - id:" の行数を数える
+    
+    Args:
+        content: フラッシュカードYAMLの内容
+        
+    Returns:
+        フラッシュカードの枚数（リストの要素数と一致しない場合は0）
+    """
+    key = _FLASHCARDS_KEY_RE.search(content)
+    if key is None:
+        return 0
+    
+    block_end = _TOP_LEVEL_LINE_RE.search(content, key.end())
+    end = block_end.start() if block_end else len(content)
+    
+    id_count = sum(1 for _ in _FLASHCARD_ID_RE.finditer(content, key.end(), end))
+    entry_count = sum(1 for _ in _FLASHCARD_ENTRY_RE.finditer(content, key.end(), end))
+    
+    # idで始まらない要素がある場合は行数から枚数を判断しない
+    return id_count if id_count == entry_count else 0
@@ -0,0 +1,56 @@
+"""Gemini APIクライアントの共有モジュール"""
+
+import asyncio
+import functools
+import weakref
+from typing import Tuple
+
+from google import genai
+
+# イベントループごとの (APIキー, クライアント)（非同期クライアントの接続はループに紐づくため）
+# ループが破棄されると対応するエントリも自動的に消える
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[str, genai.Client]]"
+_loop_clients = weakref.WeakKeyDictionary()
+
+
+def get_genai_client(api_key: str) -> genai.Client:
+    """
+    共有するGemini APIクライアントを取得
+    
+    LLMClientとTTSClientで同じクライアント（HTTPコネクションプール）を使い回す。
+    イベントループ内で呼ばれた場合はそのループ専用のクライアントを返すため、
+    asyncio.run を繰り返しても前のループの接続を再利用することはない。
+    
+    Args:
+        api_key: Gemini APIキー
+        
+    Returns:
+        Gemini APIクライアント
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _get_process_client(api_key)
+    
+    entry = _loop_clients.get(loop)
+    if entry is None or entry[0] != api_key:
+        entry = (api_key, genai.Client(api_key=api_key))
+        _loop_clients[loop] = entry
+    return entry[1]
+
+
+async def aclose_genai_client() -> None:
+    """実行中のイベントループ用のクライアントの非同期接続を閉じて破棄"""
+    entry = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if entry is None:
+        return
+    
+    aclose = getattr(entry[1].aio, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_process_client(api_key: str) -> genai.Client:
+    """イベントループ外（同期処理）で共有するクライアントを取得"""
+    return genai.Client(api_key=api_key)
@@ -1,16 +1,43 @@
 """Gemini LLMクライアント"""
 
+import asyncio
+import random
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
 
-from google import genai
 from google.genai import types
 
 from learnpod.config import config
+from learnpod.generator._client import get_genai_client
+from learnpod.generator.token_cache import get_token_cache
+from learnpod.utils.llm_cache import LLMCache, get_llm_cache
 from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# リトライ待機時間の上限（秒）
+MAX_BACKOFF_SECONDS = 32
+
+# generate_batch で同時に送るリクエストの最大数
+MAX_BATCH_WORKERS = 4
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    リトライ待機時間を算出（ジッター付き指数バックオフ）
+    
+    並行実行中のリクエストが同時にリトライしてAPIに集中しないよう、
+    待機時間を0.5〜1.5倍の範囲でランダムにずらす。
+    
+    Args:
+        attempt: 試行回数（0始まり）
+        
+    Returns:
+        待機時間（秒）
+    """
+    return min(MAX_BACKOFF_SECONDS, 2 ** attempt) * (0.5 + random.random())
+
 
 class LLMClient:
     """Gemini LLMクライアント"""
@@ -22,8 +49,11 @@ class LLMClient:
         """
         self.model_name = model_name or config.llm_model
         
-        # Gemini APIクライアントの初期化
-        self.client = genai.Client(api_key=config.gemini_api_key)
+        # Gemini APIクライアントの取得（プロセス内で共有）
+        self.client = get_genai_client(config.gemini_api_key)
+        
+        # レスポンスキャッシュ（プロセス内で共有）
+        self.cache = get_llm_cache()
         
         logger.info(f"LLMクライアント初期化完了: {self.model_name}")
     
@@ -49,17 +79,13 @@ class LLMClient:
         Raises:
             Exception: 生成に失敗した場合
         """
-        contents = [
-            types.Content(
-                role="user",
-                parts=[types.Part.from_text(text=prompt)],
-            ),
-        ]
+        cache_key = self._cache_key(prompt, temperature, max_output_tokens)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        generate_content_config = types.GenerateContentConfig(
-            temperature=temperature,
-            max_output_tokens=max_output_tokens,
-            response_mime_type="text/plain",
+        contents, generate_content_config = self._build_request(
+            prompt, temperature, max_output_tokens
         )
         
         for attempt in range(max_retries):
@@ -75,6 +101,7 @@ class LLMClient:
                 
                 if response.text:
                     logger.info(f"LLM生成成功: {len(response.text)} 文字")
+                    self.cache.set(cache_key, response.text)
                     return response.text
                 else:
                     raise ValueError("空のレスポンスが返されました")
@@ -83,9 +110,9 @@ class LLMClient:
                 logger.warning(f"LLM生成失敗 (試行 {attempt + 1}): {e}")
                 
                 if attempt < max_retries - 1:
-                    # 指数バックオフ
-                    wait_time = 2 ** attempt
-                    logger.info(f"{wait_time}秒待機してリトライします...")
+                    # ジッター付き指数バックオフ
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"{wait_time:.1f}秒待機してリトライします...")
                     time.sleep(wait_time)
                 else:
                     logger.error(f"LLM生成が最大リトライ回数に達しました: {e}")
@@ -93,6 +120,302 @@ class LLMClient:
         
         raise Exception("LLM生成に失敗しました")
     
+    def generate_batch(
+        self,
+        prompts: List[str],
+        max_retries: int = 3,
+        temperature: float = 0.7,
+        max_output_tokens: Optional[int] = None,
+    ) -> List[str]:
+        """
+        複数プロンプトのテキストを並行生成
+        
+        各リクエストはスレッドから同期クライアントで送信する（非同期クライアントの接続は
+        イベントループに紐づくため、同期処理の中で新しいイベントループは作らない）。
+        
+        Args:
+            prompts: 入力プロンプトのリスト
+            max_retries: 最大リトライ回数
+            temperature: 生成の創造性（0.0-1.0）
+            max_output_tokens: 最大出力トークン数
+            
+        Returns:
+            プロンプトと同じ順序の生成テキストのリスト
+            
+        Raises:
+            Exception: いずれかの生成に失敗した場合
+        """
+        if len(prompts) <= 1:
+            return [
+                self.generate(prompt, max_retries, temperature, max_output_tokens)
+                for prompt in prompts
+            ]
+        
+        max_workers = min(MAX_BATCH_WORKERS, len(prompts))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda prompt: self.generate(prompt, max_retries, temperature, max_output_tokens),
+                prompts,
+            ))
+    
+    async def generate_async(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        temperature: float = 0.7,
+        max_output_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        テキスト生成（非同期版）
+        
+        独立した生成リクエストを asyncio.gather で並行実行するために使用する。
+        
+        Args:
+            prompt: 入力プロンプト
+            max_retries: 最大リトライ回数
+            temperature: 生成の創造性（0.0-1.0）
+            max_output_tokens: 最大出力トークン数
+            
+        Returns:
+            生成されたテキスト
+            
+        Raises:
+            Exception: 生成に失敗した場合
+        """
+        cache_key = self._cache_key(prompt, temperature, max_output_tokens)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        contents, generate_content_config = self._build_request(
+            prompt, temperature, max_output_tokens
+        )
+        
+        for attempt in range(max_retries):
+            try:
+                logger.info(f"LLM非同期生成開始 (試行 {attempt + 1}/{max_retries})")
+                
+                response = await self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=contents,
+                    config=generate_content_config,
+                )
+                
+                if response.text:
+                    logger.info(f"LLM生成成功: {len(response.text)} 文字")
+                    self.cache.set(cache_key, response.text)
+                    return response.text
+                else:
+                    raise ValueError("空のレスポンスが返されました")
+                    
+            except Exception as e:
+                logger.warning(f"LLM生成失敗 (試行 {attempt + 1}): {e}")
+                
+                if attempt < max_retries - 1:
+                    # ジッター付き指数バックオフ（イベントループはブロックしない）
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"{wait_time:.1f}秒待機してリトライします...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error(f"LLM生成が最大リトライ回数に達しました: {e}")
+                    raise
+        
+        raise Exception("LLM生成に失敗しました")
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        temperature: float = 0.7,
+        max_output_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        テキスト生成（ストリーミング）
+        
+        レスポンス全体を待たずに、届いたテキストを順次返す。
+        リトライはストリームの最初のテキストを受け取るまでの間のみ行う。
+        
+        Args:
+            prompt: 入力プロンプト
+            max_retries: 最大リトライ回数
+            temperature: 生成の創造性（0.0-1.0）
+            max_output_tokens: 最大出力トークン数
+            
+        Yields:
+            生成されたテキストの断片
+            
+        Raises:
+            Exception: 生成に失敗した場合
+        """
+        cache_key = self._cache_key(prompt, temperature, max_output_tokens)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        contents, generate_content_config = self._build_request(
+            prompt, temperature, max_output_tokens
+        )
+        
+        for attempt in range(max_retries):
+            try:
+                logger.info(f"LLMストリーミング生成開始 (試行 {attempt + 1}/{max_retries})")
+                
+                stream = iter(self.client.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=contents,
+                    config=generate_content_config,
+                ))
+                first_text = self._first_text(stream)
+                break
+                
+            except Exception as e:
+                logger.warning(f"LLM生成失敗 (試行 {attempt + 1}): {e}")
+                
+                if attempt < max_retries - 1:
+                    # ジッター付き指数バックオフ
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"{wait_time:.1f}秒待機してリトライします...")
+                    time.sleep(wait_time)
+                else:
+                    logger.error(f"LLM生成が最大リトライ回数に達しました: {e}")
+                    raise
+        else:
+            raise Exception("LLM生成に失敗しました")
+        
+        # キャッシュ保存用に断片を保持
+        pieces = [first_text]
+        yield first_text
+        
+        for chunk in stream:
+            if chunk.text:
+                pieces.append(chunk.text)
+                yield chunk.text
+        
+        text = "".join(pieces)
+        logger.info(f"LLM生成成功: {len(text)} 文字")
+        self.cache.set(cache_key, text)
+    
+    async def generate_stream_async(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        temperature: float = 0.7,
+        max_output_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        テキスト生成（ストリーミング・非同期版）
+        
+        Args:
+            prompt: 入力プロンプト
+            max_retries: 最大リトライ回数
+            temperature: 生成の創造性（0.0-1.0）
+            max_output_tokens: 最大出力トークン数
+            
+        Yields:
+            生成されたテキストの断片
+            
+        Raises:
+            Exception: 生成に失敗した場合
+        """
+        cache_key = self._cache_key(prompt, temperature, max_output_tokens)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        contents, generate_content_config = self._build_request(
+            prompt, temperature, max_output_tokens
+        )
+        
+        for attempt in range(max_retries):
+            try:
+                logger.info(f"LLM非同期ストリーミング生成開始 (試行 {attempt + 1}/{max_retries})")
+                
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=contents,
+                    config=generate_content_config,
+                )
+                first_text = await self._first_text_async(stream)
+                break
+                
+            except Exception as e:
+                logger.warning(f"LLM生成失敗 (試行 {attempt + 1}): {e}")
+                
+                if attempt < max_retries - 1:
+                    # ジッター付き指数バックオフ（イベントループはブロックしない）
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"{wait_time:.1f}秒待機してリトライします...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error(f"LLM生成が最大リトライ回数に達しました: {e}")
+                    raise
+        else:
+            raise Exception("LLM生成に失敗しました")
+        
+        # キャッシュ保存用に断片を保持
+        pieces = [first_text]
+        yield first_text
+        
+        async for chunk in stream:
+            if chunk.text:
+                pieces.append(chunk.text)
+                yield chunk.text
+        
+        text = "".join(pieces)
+        logger.info(f"LLM生成成功: {len(text)} 文字")
+        self.cache.set(cache_key, text)
+    
+    @staticmethod
+    def _first_text(stream: Iterator[types.GenerateContentResponse]) -> str:
+        """ストリームから最初の空でないテキストを取得"""
+        for chunk in stream:
+            if chunk.text:
+                return chunk.text
+        raise ValueError("空のレスポンスが返されました")
+    
+    @staticmethod
+    async def _first_text_async(
+        stream: AsyncIterator[types.GenerateContentResponse],
+    ) -> str:
+        """ストリームから最初の空でないテキストを取得（非同期版）"""
+        async for chunk in stream:
+            if chunk.text:
+                return chunk.text
+        raise ValueError("空のレスポンスが返されました")
+    
+    def _cache_key(
+        self,
+        prompt: str,
+        temperature: float,
+        max_output_tokens: Optional[int],
+    ) -> str:
+        """生成条件からレスポンスキャッシュのキーを算出"""
+        return LLMCache.make_key(self.model_name, temperature, prompt, max_output_tokens)
+    
+    def _build_request(
+        self,
+        prompt: str,
+        temperature: float,
+        max_output_tokens: Optional[int],
+    ) -> Tuple[List[types.Content], types.GenerateContentConfig]:
+        """生成リクエストのコンテンツと設定を構築"""
+        contents = [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=prompt)],
+            ),
+        ]
+        
+        generate_content_config = types.GenerateContentConfig(
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            response_mime_type="text/plain",
+        )
+        
+        return contents, generate_content_config
+    
     def count_tokens(self, text: str) -> int:
         """
         テキストのトークン数を概算
@@ -104,23 +427,34 @@ class LLMClient:
             概算トークン数
         """
         try:
-            # 新しいAPIでのトークンカウント
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text=text)],
-                ),
-            ]
-            
-            response = self.client.models.count_tokens(
-                model=self.model_name,
-                contents=contents,
-            )
-            return response.total_tokens
+            return get_token_cache().count_tokens(text, self.model_name, self._count_tokens_api)
         except Exception as e:
             logger.warning(f"トークンカウント失敗、概算値を使用: {e}")
             # 日本語の場合、文字数の約0.7倍がトークン数の概算
-            return int(len(text) * 0.7)
+            return len(text) * 7 // 10
+    
+    def _count_tokens_api(self, text: str) -> int:
+        """
+        APIでトークン数をカウント
+        
+        Args:
+            text: 対象テキスト
+            
+        Returns:
+            トークン数
+        """
+        contents = [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=text)],
+            ),
+        ]
+        
+        response = self.client.models.count_tokens(
+            model=self.model_name,
+            contents=contents,
+        )
+        return response.total_tokens
     
     def is_token_limit_exceeded(self, text: str, limit: int = 30000) -> bool:
         """
@@ -133,6 +467,10 @@ class LLMClient:
         Returns:
             制限を超過している場合True
         """
+        # 1トークンはUTF-8で1バイト以上のため、バイト数が制限内なら数えるまでもない
+        if len(text) * 4 <= limit or len(text.encode("utf-8")) <= limit:
+            return False
+        
         token_count = self.count_tokens(text)
         logger.debug(f"トークン数: {token_count}/{limit}")
         return token_count > limit 
\ No newline at end of file
@@ -2,42 +2,14 @@
 
 from typing import Dict, List, Tuple
 
-
-class PromptBuilder:
-    """プロンプト生成クラス"""
-    
-    @staticmethod
-    def build_script_prompt(
-        content: str,
-        language: str = "ja",
-        target_length: int = 20,
-        speakers: Dict[str, str] = None,
-    ) -> str:
-        """
-        台本生成プロンプトを構築
-        
-        Args:
-            content: 入力コンテンツ
-            language: 言語設定
-            target_length: 目標時間（分）
-            speakers: スピーカー設定
-            
-        Returns:
-            台本生成プロンプト
-        """
-        if speakers is None:
-            speakers = {"S1": "Sakura", "S2": "Taro"}
-        
-        speaker_list = "\n".join([f"- {k}: {v}" for k, v in speakers.items()])
-        
-        return f"""あなたは教育的なポッドキャスト台本の専門家です。以下の学習資料を基に、{target_length}分程度のポッドキャスト台本を作成してください。
-
-## 入力資料
-{content}
+# 台本生成プロンプト
+# チャンクごとに変わる入力資料は末尾に置き、それより前はすべての呼び出しで同一の文字列にする
+# （プロバイダ側の暗黙的なプレフィックスキャッシュが効くようにするため）
+_SCRIPT_PROMPT_PREFIX = """あなたは教育的なポッドキャスト台本の専門家です。末尾の学習資料を基に、{target_length}分程度のポッドキャスト台本を作成してください。
 
 ## 要件
 - 言語: {language}
-- 目標時間: {target_length}分（約{target_length * 150}語）
+- 目標時間: {target_length}分（約{target_words}語）
 - スピーカー構成:
 {speaker_list}
 
@@ -59,21 +31,33 @@ Speaker 2: [発言内容]
 - 聞き手が理解しやすいペースで情報を提示する
 - 専門用語や概念は必ず解説を含める
 - 実用的な応用例や背景情報も適切に織り込む
+"""
+
+_SCRIPT_PROMPT_CONTENT = """
+## 入力資料
+{content}
 
 台本を作成してください："""
 
-    @staticmethod
-    def build_explainer_prompt(script_content: str) -> str:
-        """
-        詳細解説生成プロンプトを構築
-        
-        Args:
-            script_content: 台本内容
-            
-        Returns:
-            詳細解説生成プロンプト
-        """
-        return f"""あなたは教育コンテンツの解説専門家です。以下のポッドキャスト台本を基に、詳細解説を作成してください。
+# 長い資料の分割チャンクを要点アウトラインに要約するプロンプト（台本生成の前段）
+# 台本生成プロンプトと同様に、チャンクごとに変わる資料は末尾に置く
+_OUTLINE_PROMPT_PREFIX = """あなたは教育コンテンツの編集者です。末尾の学習資料は長い資料の一部です。ポッドキャスト台本の元資料として使うため、この部分の要点アウトラインを作成してください。
+
+## 要件
+- 言語: {language}
+- 箇条書きで記述し、重要な概念・用語の定義・具体例・数値や根拠を漏らさず残す
+- 200〜400語程度に収める
+- 導入やまとめの文、資料にない情報は加えない
+"""
+
+_OUTLINE_PROMPT_CONTENT = """
+## 学習資料（一部）
+{content}
+
+要点アウトラインを作成してください："""
+
+# 詳細解説生成プロンプト
+_EXPLAINER_PROMPT = """あなたは教育コンテンツの解説専門家です。以下のポッドキャスト台本を基に、詳細解説を作成してください。
 
 ## 台本内容
 {script_content}
@@ -109,28 +93,8 @@ Speaker 2: [発言内容]
 
 詳細解説を作成してください："""
 
-    @staticmethod
-    def build_qa_prompt(
-        content: str,
-        total_questions: int = 20,
-        ratios: Tuple[float, float, float] = (0.5, 0.4, 0.1),
-    ) -> str:
-        """
-        Q&A生成プロンプトを構築
-        
-        Args:
-            content: 対象コンテンツ
-            total_questions: 総問題数
-            ratios: (Keyword, Why, Open)の比率
-            
-        Returns:
-            Q&A生成プロンプト
-        """
-        keyword_count = int(total_questions * ratios[0])
-        why_count = int(total_questions * ratios[1])
-        open_count = total_questions - keyword_count - why_count
-        
-        return f"""あなたは教育的なQ&A作成の専門家です。以下のコンテンツを基に、学習効果の高いQ&Aセットを作成してください。
+# Q&A生成プロンプト
+_QA_PROMPT = """あなたは教育的なQ&A作成の専門家です。以下のコンテンツを基に、学習効果の高いQ&Aセットを作成してください。
 
 ## 対象コンテンツ
 {content}
@@ -167,11 +131,11 @@ Speaker 2: [発言内容]
   **A:** [回答]  <!-- flashcard:id=[英数字のID] -->
 
 ## Why Q&A
-- **Q{keyword_count + 1}:** [問題文]  
+- **Q{why_start}:** [問題文]  
   **A:** [回答]
 
 ## Open Questions
-- **Q{keyword_count + why_count + 1}:** [問題文]  
+- **Q{open_start}:** [問題文]  
   **A:** [回答例や考察のポイント]
 ```
 
@@ -183,18 +147,8 @@ Speaker 2: [発言内容]
 
 Q&Aセットを作成してください："""
 
-    @staticmethod
-    def build_flashcard_yaml_prompt(keyword_qa: str) -> str:
-        """
-        フラッシュカードYAML生成プロンプトを構築
-        
-        Args:
-            keyword_qa: Keyword Q&Aセクション
-            
-        Returns:
-            フラッシュカードYAML生成プロンプト
-        """
-        return f"""以下のKeyword Q&Aを基に、フラッシュカード学習用のYAMLファイルを作成してください。
+# フラッシュカードYAML生成プロンプト
+_FLASHCARD_YAML_PROMPT = """以下のKeyword Q&Aを基に、フラッシュカード学習用のYAMLファイルを作成してください。
 
 ## Keyword Q&A
 {keyword_qa}
@@ -219,4 +173,113 @@ flashcards:
 - categoryは"keyword"で統一
 - YAML形式を正確に守る
 
-フラッシュカードYAMLを作成してください：""" 
\ No newline at end of file
+フラッシュカードYAMLを作成してください："""
+
+
+class PromptBuilder:
+    """プロンプト生成クラス"""
+    
+    @staticmethod
+    def build_script_prompt(
+        content: str,
+        language: str = "ja",
+        target_length: int = 20,
+        speakers: Dict[str, str] = None,
+    ) -> str:
+        """
+        台本生成プロンプトを構築
+        
+        Args:
+            content: 入力コンテンツ
+            language: 言語設定
+            target_length: 目標時間（分）
+            speakers: スピーカー設定
+            
+        Returns:
+            台本生成プロンプト
+        """
+        if speakers is None:
+            speakers = {"S1": "Sakura", "S2": "Taro"}
+        
+        speaker_list = "\n".join([f"- {k}: {v}" for k, v in speakers.items()])
+        
+        prefix = _SCRIPT_PROMPT_PREFIX.format(
+            language=language,
+            target_length=target_length,
+            target_words=target_length * 150,
+            speaker_list=speaker_list,
+        )
+        return prefix + _SCRIPT_PROMPT_CONTENT.format(content=content)
+    
+    @staticmethod
+    def build_outline_prompt(content: str, language: str = "ja") -> str:
+        """
+        チャンクの要点アウトライン生成プロンプトを構築
+        
+        Args:
+            content: 分割されたチャンクの内容
+            language: 言語設定
+            
+        Returns:
+            要点アウトライン生成プロンプト
+        """
+        return _OUTLINE_PROMPT_PREFIX.format(
+            language=language
+        ) + _OUTLINE_PROMPT_CONTENT.format(content=content)
+    
+    @staticmethod
+    def build_explainer_prompt(script_content: str) -> str:
+        """
+        詳細解説生成プロンプトを構築
+        
+        Args:
+            script_content: 台本内容
+            
+        Returns:
+            詳細解説生成プロンプト
+        """
+        return _EXPLAINER_PROMPT.format(script_content=script_content)
+    
+    @staticmethod
+    def build_qa_prompt(
+        content: str,
+        total_questions: int = 20,
+        ratios: Tuple[float, float, float] = (0.5, 0.4, 0.1),
+    ) -> str:
+        """
+        Q&A生成プロンプトを構築
+        
+        Args:
+            content: 対象コンテンツ
+            total_questions: 総問題数
+            ratios: (Keyword, Why, Open)の比率
+            
+        Returns:
+            Q&A生成プロンプト
+        """
+        keyword_count = int(total_questions * ratios[0])
+        why_count = int(total_questions * ratios[1])
+        open_count = total_questions - keyword_count - why_count
+        
+        return _QA_PROMPT.format(
+            content=content,
+            total_questions=total_questions,
+            keyword_count=keyword_count,
+            why_count=why_count,
+            open_count=open_count,
+            why_start=keyword_count + 1,
+            open_start=keyword_count + why_count + 1,
+        )
+    
+    @staticmethod
+    def build_flashcard_yaml_prompt(keyword_qa: str) -> str:
+        """
+        フラッシュカードYAML生成プロンプトを構築
+        
+        Args:
+            keyword_qa: Keyword Q&Aセクション
+            
+        Returns:
+            フラッシュカードYAML生成プロンプト
+        """
+        return _FLASHCARD_YAML_PROMPT.format(keyword_qa=keyword_qa) 
\ No newline at end of file
@@ -1,5 +1,6 @@
 """テキスト分割モジュール"""
 
+import functools
 import re
 from typing import List
 
@@ -8,6 +9,29 @@ from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 段落の区切り（空行）
+_PARA_RE = re.compile(r'\n\s*\n')
+
+# 改行直後の改行以外の空白文字（空白文字だけの行がありうる場合のみ正規表現で段落を分割）
+_LINE_LEADING_SPACE_RE = re.compile(r'\n[^\S\n]')
+
+# 日本語の文区切り
+_SENT_RE = re.compile(r'[。！？]')
+
+# 台本の空でない行（前後の空白を除いた行全体と、スピーカー発言の場合はスピーカー名）
+# スピーカー発言は "Speaker 1: ..." / "S1: ..." の形式で、コロンの後に内容があるもの
+_SCRIPT_LINE_RE = re.compile(
+    r'^[^\S\n]*((?:(Speaker \d+|S\d+):(?=[^\n]*\S))?[^\n]*\S)',
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _estimate_tokens(text: str) -> int:
+    """トークン数の概算（同一テキストの結果はキャッシュ）"""
+    # 日本語の場合、文字数の約0.7倍がトークン数の概算
+    return len(text) * 7 // 10
+
 
 class TextSplitter:
     """テキスト分割クラス"""
@@ -35,42 +59,70 @@ class TextSplitter:
             # トークン制限内の場合はそのまま返す
             return [text]
         
+        return self._split_over_limit(text, llm_client)
+    
+    def maybe_split(self, text: str, llm_client, limit: int = 30000) -> List[str]:
+        """
+        テキストがトークン制限を超える場合のみチャンクサイズで分割
+        
+        制限の判定とチャンクサイズの判定でトークン数を二重に数えないよう、
+        制限がチャンクサイズ以上の場合は制限超過の時点で分割に進む。
+        
+        Args:
+            text: 分割対象テキスト
+            llm_client: トークンカウント用のLLMクライアント
+            limit: 分割が必要になるトークン数
+            
+        Returns:
+            分割されたテキストのリスト（制限内の場合は [text]）
+        """
+        if not llm_client.is_token_limit_exceeded(text, limit):
+            return [text]
+        
+        if limit >= self.chunk_size:
+            # 制限を超えていればチャンクサイズも必ず超えている
+            return self._split_over_limit(text, llm_client)
+        return self.split_by_tokens(text, llm_client)
+    
+    def _split_over_limit(self, text: str, llm_client=None) -> List[str]:
+        """
+        チャンクサイズを超えるテキストを段落・文単位で分割
+        
+        Args:
+            text: 分割対象テキスト
+            llm_client: トークンカウント用のLLMクライアント
+            
+        Returns:
+            分割されたテキストのリスト
+        """
         # 段落単位で分割を試行
+        # トークン数は段落ごとに概算して積算し、連結済みの文字列は数え直さない
         paragraphs = self._split_by_paragraphs(text)
         chunks = []
-        current_chunk = ""
+        current_parts: List[str] = []
+        current_tokens = 0
         
         for paragraph in paragraphs:
-            # 段落を追加した場合のトークン数をチェック
-            test_chunk = current_chunk + "\n\n" + paragraph if current_chunk else paragraph
+            # 段落を追加した場合のトークン数（区切りの"\n\n"分を含む）
+            p_tokens = _estimate_tokens(paragraph) + (2 if current_parts else 0)
             
-            if llm_client:
-                if llm_client.is_token_limit_exceeded(test_chunk, self.chunk_size):
-                    # 制限を超える場合、現在のチャンクを保存
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = paragraph
-                    else:
-                        # 単一段落が制限を超える場合、文単位で分割
-                        sentence_chunks = self._split_by_sentences(paragraph, llm_client)
-                        chunks.extend(sentence_chunks)
+            if current_tokens + p_tokens > self.chunk_size:
+                # 制限を超える場合、現在のチャンクを保存
+                if current_parts:
+                    chunks.extend(self._finalize_chunk(current_parts, "\n\n", llm_client))
+                    current_parts = [paragraph]
+                    current_tokens = _estimate_tokens(paragraph)
                 else:
-                    current_chunk = test_chunk
+                    # 単一段落が制限を超える場合、文単位で分割
+                    sentence_chunks = self._split_by_sentences(paragraph, llm_client)
+                    chunks.extend(sentence_chunks)
             else:
-                # LLMクライアントがない場合は概算で判定
-                if self._estimate_tokens(test_chunk) > self.chunk_size:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = paragraph
-                    else:
-                        sentence_chunks = self._split_by_sentences(paragraph)
-                        chunks.extend(sentence_chunks)
-                else:
-                    current_chunk = test_chunk
+                current_parts.append(paragraph)
+                current_tokens += p_tokens
         
         # 最後のチャンクを追加
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_parts:
+            chunks.extend(self._finalize_chunk(current_parts, "\n\n", llm_client))
         
         logger.info(f"テキスト分割完了: {len(chunks)} チャンク")
         return chunks
@@ -85,37 +137,23 @@ class TextSplitter:
         Returns:
             分割された台本チャンクのリスト
         """
-        # スピーカー発言の抽出
-        speaker_pattern = r'^(Speaker \d+|S\d+):\s*(.+)$'
-        lines = script.split('\n')
-        
+        # 空でない行（前後の空白を除去済み）とスピーカー名を1回の走査で抽出
         chunks = []
         current_chunk = []
         current_tokens = 0
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        for line, speaker in _SCRIPT_LINE_RE.findall(script):
+            line_tokens = _estimate_tokens(line)
             
-            # スピーカー発言の解析
-            match = re.match(speaker_pattern, line, re.MULTILINE)
-            if match:
-                speaker, content = match.groups()
-                line_tokens = self._estimate_tokens(line)
-                
-                # チャンクサイズを超える場合
-                if current_tokens + line_tokens > self.chunk_size and current_chunk:
-                    chunks.append('\n'.join(current_chunk))
-                    current_chunk = [line]
-                    current_tokens = line_tokens
-                else:
-                    current_chunk.append(line)
-                    current_tokens += line_tokens
+            # スピーカー発言がチャンクサイズを超える場合は新しいチャンクを開始
+            if speaker and current_tokens + line_tokens > self.chunk_size and current_chunk:
+                chunks.append('\n'.join(current_chunk))
+                current_chunk = [line]
+                current_tokens = line_tokens
             else:
-                # スピーカー発言以外の行（説明など）
+                # スピーカー発言以外の行（説明など）は現在のチャンクに含める
                 current_chunk.append(line)
-                current_tokens += self._estimate_tokens(line)
+                current_tokens += line_tokens
         
         # 最後のチャンクを追加
         if current_chunk:
@@ -127,50 +165,76 @@ class TextSplitter:
     def _split_by_paragraphs(self, text: str) -> List[str]:
         """段落単位でテキストを分割"""
         # 空行で段落を分割
-        paragraphs = re.split(r'\n\s*\n', text)
+        # 空白文字だけの行がなければ、正規表現を使わず "\n\n" で分割できる
+        # （連続する改行や段落前後の空白は strip で取り除かれるため結果は同じ）
+        if _LINE_LEADING_SPACE_RE.search(text):
+            paragraphs = _PARA_RE.split(text)
+        else:
+            paragraphs = text.split("\n\n")
         return [p.strip() for p in paragraphs if p.strip()]
     
     def _split_by_sentences(self, text: str, llm_client=None) -> List[str]:
         """文単位でテキストを分割"""
         # 日本語の文区切り
-        sentences = re.split(r'[。！？]', text)
+        sentences = _SENT_RE.split(text)
         sentences = [s.strip() + '。' for s in sentences if s.strip()]
         
         if not sentences:
             return [text]
         
         chunks = []
-        current_chunk = ""
+        current_parts: List[str] = []
+        current_tokens = 0
         
         for sentence in sentences:
-            test_chunk = current_chunk + sentence if current_chunk else sentence
+            s_tokens = _estimate_tokens(sentence)
             
-            if llm_client:
-                if llm_client.is_token_limit_exceeded(test_chunk, self.chunk_size):
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = sentence
-                    else:
-                        # 単一文が制限を超える場合はそのまま追加
-                        chunks.append(sentence)
+            if current_tokens + s_tokens > self.chunk_size:
+                if current_parts:
+                    chunks.extend(self._finalize_chunk(current_parts, "", llm_client))
+                    current_parts = [sentence]
+                    current_tokens = s_tokens
                 else:
-                    current_chunk = test_chunk
+                    # 単一文が制限を超える場合はそのまま追加
+                    chunks.append(sentence)
             else:
-                if self._estimate_tokens(test_chunk) > self.chunk_size:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = sentence
-                    else:
-                        chunks.append(sentence)
-                else:
-                    current_chunk = test_chunk
+                current_parts.append(sentence)
+                current_tokens += s_tokens
         
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_parts:
+            chunks.extend(self._finalize_chunk(current_parts, "", llm_client))
         
         return chunks
     
-    def _estimate_tokens(self, text: str) -> int:
-        """トークン数の概算"""
-        # 日本語の場合、文字数の約0.7倍がトークン数の概算
-        return int(len(text) * 0.7) 
\ No newline at end of file
+    def _finalize_chunk(self, parts: List[str], separator: str, llm_client=None) -> List[str]:
+        """
+        積算したパーツを連結してチャンクを確定
+        
+        LLMクライアントがある場合は確定したチャンクに対してのみ実際のトークン数を確認し、
+        制限を超えていればパーツを半分ずつに分けて確認し直す。
+        単一の段落が制限を超える場合は文単位で分割する（単一の文はそれ以上分割しない）。
+        
+        Args:
+            parts: チャンクを構成する段落または文
+            separator: パーツ間の区切り文字列
+            llm_client: トークンカウント用のLLMクライアント
+            
+        Returns:
+            確定したチャンクのリスト
+        """
+        chunk = separator.join(parts).strip()
+        if llm_client is None or (len(parts) == 1 and not separator):
+            return [chunk]
+        
+        if not llm_client.is_token_limit_exceeded(chunk, self.chunk_size):
+            return [chunk]
+        
+        if len(parts) == 1:
+            # 概算では収まっても実際のトークン数が制限を超える段落
+            return self._split_by_sentences(chunk, llm_client)
+        
+        mid = len(parts) // 2
+        return (
+            self._finalize_chunk(parts[:mid], separator, llm_client)
+            + self._finalize_chunk(parts[mid:], separator, llm_client)
+        )
@@ -0,0 +1,139 @@
+"""トークン数キャッシュモジュール"""
+
+import functools
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from learnpod.config import config
+from learnpod.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_hash(content: str) -> str:
+    """
+    キャッシュキー用のテキストのハッシュを計算
+    
+    Args:
+        content: 対象テキスト
+        
+    Returns:
+        16バイトのBLAKE2bダイジェスト（16進文字列）
+    """
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TokenCache:
+    """
+    テキストのハッシュとモデル名をキーにしたトークン数キャッシュ
+    
+    プロセス内ではメモリ上の辞書に保持し、db_pathを指定した場合は
+    SQLiteにも保存して再実行時にも同じテキストのカウントを省略する。
+    """
+    
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        """
+        Args:
+            db_path: 永続化に使うSQLiteファイルのパス（Noneの場合はメモリのみ）
+        """
+        self._memory: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        
+        if db_path is not None:
+            try:
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS tokens ("
+                    "hash TEXT NOT NULL, model TEXT NOT NULL, count INTEGER NOT NULL, "
+                    "PRIMARY KEY (hash, model))"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"トークンキャッシュDBを開けません、メモリのみ使用: {e}")
+                self._db = None
+    
+    def get(self, key: str, model: str) -> Optional[int]:
+        """
+        キャッシュ済みのトークン数を取得
+        
+        Args:
+            key: テキストのハッシュ
+            model: モデル名
+            
+        Returns:
+            トークン数（キャッシュがない場合はNone）
+        """
+        with self._lock:
+            count = self._memory.get((key, model))
+            if count is not None or self._db is None:
+                return count
+            
+            try:
+                row = self._db.execute(
+                    "SELECT count FROM tokens WHERE hash = ? AND model = ?",
+                    (key, model),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"トークンキャッシュ読み込み失敗: {e}")
+                return None
+            
+            if row is None:
+                return None
+            self._memory[(key, model)] = row[0]
+            return row[0]
+    
+    def set(self, key: str, model: str, count: int) -> None:
+        """
+        トークン数をキャッシュに保存
+        
+        Args:
+            key: テキストのハッシュ
+            model: モデル名
+            count: トークン数
+        """
+        with self._lock:
+            self._memory[(key, model)] = count
+            if self._db is None:
+                return
+            
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tokens (hash, model, count) VALUES (?, ?, ?)",
+                    (key, model, count),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.debug(f"トークンキャッシュ書き込み失敗: {e}")
+    
+    def count_tokens(self, content: str, model: str, counter: Callable[[str], int]) -> int:
+        """
+        キャッシュを参照してトークン数を取得
+        
+        キャッシュにない場合のみcounterを呼び出す。counterが例外を送出した場合は
+        そのまま送出し、失敗結果はキャッシュしない。
+        
+        Args:
+            content: 対象テキスト
+            model: モデル名
+            counter: 実際にトークン数をカウントする関数
+            
+        Returns:
+            トークン数
+        """
+        key = content_hash(content)
+        count = self.get(key, model)
+        if count is None:
+            count = counter(content)
+            self.set(key, model, count)
+        return count
+
+
+@functools.lru_cache(maxsize=1)
+def get_token_cache() -> TokenCache:
+    """プロセス内で共有するトークン数キャッシュを取得"""
+    return TokenCache(config.cache_dir / "tokens.sqlite")
@@ -1,20 +1,24 @@
 """Gemini TTSクライアント"""
 
+import asyncio
 import mimetypes
 import os
 import struct
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
-from google import genai
 from google.genai import types
 
 from learnpod.config import config
+from learnpod.generator._client import get_genai_client
 from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# WAVファイルヘッダー（44バイト）のレイアウト
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
 
 class TTSClient:
     """Gemini TTSクライアント"""
@@ -26,8 +30,11 @@ class TTSClient:
         """
         self.model_name = model_name or config.tts_model
         
-        # Gemini APIクライアントの初期化
-        self.client = genai.Client(api_key=config.gemini_api_key)
+        # Gemini APIクライアントの取得（プロセス内で共有）
+        self.client = get_genai_client(config.gemini_api_key)
+        
+        # スピーカー設定ごとの生成設定（チャンクごとに作り直さない）
+        self._config_cache: Dict[Tuple[Tuple[str, str], ...], types.GenerateContentConfig] = {}
         
         logger.info(f"TTSクライアント初期化完了: {self.model_name}")
     
@@ -55,20 +62,6 @@ class TTSClient:
         """
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # スピーカー設定の構築
-        speaker_voice_configs = []
-        for speaker_id, voice_name in speaker_configs.items():
-            speaker_voice_configs.append(
-                types.SpeakerVoiceConfig(
-                    speaker=speaker_id,
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name=voice_name
-                        )
-                    ),
-                )
-            )
-        
         contents = [
             types.Content(
                 role="user",
@@ -76,56 +69,22 @@ class TTSClient:
             ),
         ]
         
-        generate_content_config = types.GenerateContentConfig(
-            temperature=1,
-            response_modalities=["audio"],
-            speech_config=types.SpeechConfig(
-                multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
-                    speaker_voice_configs=speaker_voice_configs
-                ),
-            ),
-        )
+        generate_content_config = self._get_generate_content_config(speaker_configs)
         
         for attempt in range(max_retries):
             try:
                 logger.info(f"TTS生成開始 (試行 {attempt + 1}/{max_retries})")
                 
                 audio_files = []
-                file_index = 0
                 
                 for chunk in self.client.models.generate_content_stream(
                     model=self.model_name,
                     contents=contents,
                     config=generate_content_config,
                 ):
-                    if (
-                        chunk.candidates is None
-                        or chunk.candidates[0].content is None
-                        or chunk.candidates[0].content.parts is None
-                    ):
-                        continue
-                    
-                    part = chunk.candidates[0].content.parts[0]
-                    if part.inline_data and part.inline_data.data:
-                        file_name = f"audio_chunk_{file_index}"
-                        file_index += 1
-                        
-                        inline_data = part.inline_data
-                        data_buffer = inline_data.data
-                        file_extension = mimetypes.guess_extension(inline_data.mime_type)
-                        
-                        if file_extension is None:
-                            file_extension = ".wav"
-                            data_buffer = self._convert_to_wav(
-                                inline_data.data, inline_data.mime_type
-                            )
-                        
-                        audio_path = output_dir / f"{file_name}{file_extension}"
-                        self._save_binary_file(audio_path, data_buffer)
+                    audio_path = self._save_stream_chunk(chunk, output_dir, len(audio_files))
+                    if audio_path is not None:
                         audio_files.append(audio_path)
-                    
-                    elif chunk.text:
-                        logger.debug(f"TTS応答テキスト: {chunk.text}")
                 
                 if audio_files:
                     logger.info(f"TTS生成成功: {len(audio_files)} ファイル")
@@ -147,22 +106,195 @@ class TTSClient:
         
         raise Exception("TTS生成に失敗しました")
     
-    def _save_binary_file(self, file_path: Path, data: bytes) -> None:
-        """バイナリファイルの保存"""
+    async def generate_audio_async(
+        self,
+        text: str,
+        speaker_configs: Dict[str, str],
+        output_dir: Path,
+        max_retries: int = 3,
+    ) -> List[Path]:
+        """
+        マルチスピーカー音声生成（非同期版）
+        
+        複数チャンクのTTSリクエストを asyncio.gather で並行実行するために使用する。
+        
+        Args:
+            text: 台本テキスト（Speaker X: 形式）
+            speaker_configs: スピーカー設定 {"S1": "Zephyr", "S2": "Puck"}
+            output_dir: 出力ディレクトリ
+            max_retries: 最大リトライ回数
+            
+        Returns:
+            生成された音声ファイルのパスリスト
+            
+        Raises:
+            Exception: 音声生成に失敗した場合
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        contents = [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=text)],
+            ),
+        ]
+        
+        generate_content_config = self._get_generate_content_config(speaker_configs)
+        
+        for attempt in range(max_retries):
+            try:
+                logger.info(f"TTS非同期生成開始 (試行 {attempt + 1}/{max_retries})")
+                
+                audio_files = []
+                
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=contents,
+                    config=generate_content_config,
+                )
+                async for chunk in stream:
+                    audio_path = self._save_stream_chunk(chunk, output_dir, len(audio_files))
+                    if audio_path is not None:
+                        audio_files.append(audio_path)
+                
+                if audio_files:
+                    logger.info(f"TTS生成成功: {len(audio_files)} ファイル")
+                    return audio_files
+                else:
+                    raise ValueError("音声データが生成されませんでした")
+                    
+            except Exception as e:
+                logger.warning(f"TTS生成失敗 (試行 {attempt + 1}): {e}")
+                
+                if attempt < max_retries - 1:
+                    # 指数バックオフ（イベントループはブロックしない）
+                    wait_time = 2 ** attempt
+                    logger.info(f"{wait_time}秒待機してリトライします...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error(f"TTS生成が最大リトライ回数に達しました: {e}")
+                    raise
+        
+        raise Exception("TTS生成に失敗しました")
+    
+    def _save_stream_chunk(
+        self,
+        chunk: types.GenerateContentResponse,
+        output_dir: Path,
+        file_index: int,
+    ) -> Optional[Path]:
+        """
+        ストリームの1チャンクに含まれる音声データを保存
+        
+        Args:
+            chunk: ストリームのレスポンス
+            output_dir: 出力ディレクトリ
+            file_index: 音声ファイルの連番
+            
+        Returns:
+            保存した音声ファイルのパス（音声データを含まない場合はNone）
+        """
+        if (
+            chunk.candidates is None
+            or chunk.candidates[0].content is None
+            or chunk.candidates[0].content.parts is None
+        ):
+            return None
+        
+        part = chunk.candidates[0].content.parts[0]
+        if part.inline_data and part.inline_data.data:
+            file_name = f"audio_chunk_{file_index}"
+            
+            inline_data = part.inline_data
+            data_buffer = memoryview(inline_data.data)
+            header = b""
+            file_extension = mimetypes.guess_extension(inline_data.mime_type)
+            
+            if file_extension is None:
+                # 生のPCMデータはWAVヘッダーを付けて保存（データはコピーしない）
+                file_extension = ".wav"
+                header, data_buffer = self._convert_to_wav(
+                    data_buffer, inline_data.mime_type
+                )
+            
+            audio_path = output_dir / f"{file_name}{file_extension}"
+            self._save_binary_file(audio_path, data_buffer, header)
+            return audio_path
+        
+        if chunk.text:
+            logger.debug(f"TTS応答テキスト: {chunk.text}")
+        return None
+    
+    def _get_generate_content_config(
+        self, speaker_configs: Dict[str, str]
+    ) -> types.GenerateContentConfig:
+        """
+        スピーカー設定に対応する生成設定を取得（同じ設定は再利用）
+        
+        Args:
+            speaker_configs: スピーカー設定 {"S1": "Zephyr", "S2": "Puck"}
+            
+        Returns:
+            マルチスピーカー音声生成の設定
+        """
+        key = tuple(sorted(speaker_configs.items()))
+        generate_content_config = self._config_cache.get(key)
+        if generate_content_config is not None:
+            return generate_content_config
+        
+        # スピーカー設定の構築
+        speaker_voice_configs = []
+        for speaker_id, voice_name in speaker_configs.items():
+            speaker_voice_configs.append(
+                types.SpeakerVoiceConfig(
+                    speaker=speaker_id,
+                    voice_config=types.VoiceConfig(
+                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                            voice_name=voice_name
+                        )
+                    ),
+                )
+            )
+        
+        generate_content_config = types.GenerateContentConfig(
+            temperature=1,
+            response_modalities=["audio"],
+            speech_config=types.SpeechConfig(
+                multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
+                    speaker_voice_configs=speaker_voice_configs
+                ),
+            ),
+        )
+        self._config_cache[key] = generate_content_config
+        return generate_content_config
+    
+    def _save_binary_file(
+        self,
+        file_path: Path,
+        data: Union[bytes, memoryview],
+        header: Union[bytes, bytearray] = b"",
+    ) -> None:
+        """バイナリファイルの保存（ヘッダーとデータを連結せずに順に書き込む）"""
         with open(file_path, "wb") as f:
+            if header:
+                f.write(header)
             f.write(data)
         logger.debug(f"ファイル保存完了: {file_path}")
     
-    def _convert_to_wav(self, audio_data: bytes, mime_type: str) -> bytes:
+    def _convert_to_wav(
+        self, audio_data: Union[bytes, memoryview], mime_type: str
+    ) -> Tuple[bytearray, memoryview]:
         """
         音声データをWAV形式に変換
         
+        ヘッダーとデータを連結した新しいバイト列は作らず、別々に返す。
+        
         Args:
             audio_data: 生の音声データ
             mime_type: 音声データのMIMEタイプ
             
         Returns:
-            WAV形式の音声データ
+            (WAVファイルヘッダー, 音声データ)
         """
         parameters = self._parse_audio_mime_type(mime_type)
         bits_per_sample = parameters["bits_per_sample"]
@@ -175,8 +307,10 @@ class TTSClient:
         chunk_size = 36 + data_size  # 36 bytes for header fields before data chunk size
         
         # WAVファイルヘッダーの生成
-        header = struct.pack(
-            "<4sI4s4sIHHIIHH4sI",
+        header = bytearray(_WAV_HEADER.size)
+        _WAV_HEADER.pack_into(
+            header,
+            0,
             b"RIFF",          # ChunkID
             chunk_size,       # ChunkSize (total file size - 8 bytes)
             b"WAVE",          # Format
@@ -192,7 +326,7 @@ class TTSClient:
             data_size         # Subchunk2Size (size of audio data)
         )
         
-        return header + audio_data
+        return header, memoryview(audio_data)
     
     def _parse_audio_mime_type(self, mime_type: str) -> Dict[str, int]:
         """
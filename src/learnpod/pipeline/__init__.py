@@ -1,6 +1,14 @@
 """パイプライン処理モジュール"""
 
 from .ingest import IngestedDoc, ingest_markdown
-from .orchestrator import PipelineOrchestrator
 
-__all__ = ["IngestedDoc", "ingest_markdown", "PipelineOrchestrator"] 
\ No newline at end of file
+__all__ = ["IngestedDoc", "ingest_markdown", "PipelineOrchestrator"]
+
+
+def __getattr__(name: str):
+    """重いモジュール（google.genai, pydub等）を使う属性は初回アクセス時に読み込む"""
+    if name == "PipelineOrchestrator":
+        from .orchestrator import PipelineOrchestrator
+
+        return PipelineOrchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
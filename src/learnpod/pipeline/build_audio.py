@@ -1,8 +1,13 @@
 """音声生成モジュール"""
 
+import asyncio
+import os
+import shutil
 import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from pydub import AudioSegment
 
@@ -11,11 +16,24 @@ from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# TTSチャンクを並行生成する最大スレッド数
+MAX_TTS_WORKERS = 8
+
+# 非同期版でTTSリクエストを同時に送る最大数（APIのレート制限対策）
+MAX_TTS_CONCURRENCY = 4
+
+# WAV結合時に一度に読み書きするフレーム数
+_COPY_FRAMES = 1 << 18
+
+# WAVのサンプル幅（バイト）に対応するFFmpegの入力形式
+_PCM_FORMATS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
 
 def build_audio(
     script_path: Path,
     output_dir: Path,
     speaker_configs: Optional[Dict[str, str]] = None,
+    script_content: Optional[str] = None,
 ) -> Optional[Path]:
     """
     音声を生成
@@ -24,10 +42,107 @@ def build_audio(
         script_path: 台本ファイルのパス
         output_dir: 出力ディレクトリ
         speaker_configs: スピーカー設定 {"S1": "Zephyr", "S2": "Puck"}
+        script_content: 読み込み済みの台本（省略時はscript_pathから読み込む）
+        
+    Returns:
+        生成された音声ファイルのパス（失敗時はNone）
+    """
+    tts_client, speaker_configs, script_chunks = _prepare_audio(
+        script_path, output_dir, speaker_configs, script_content
+    )
+    
+    # 各チャンクで音声生成（API待ちが大半のためスレッドで並行実行）
+    # ファイル名の衝突を避けるため、チャンクごとに出力ディレクトリを分ける
+    chunk_results: Dict[int, List[Path]] = {}
+    max_workers = min(MAX_TTS_WORKERS, len(script_chunks)) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                tts_client.generate_audio,
+                text=chunk,
+                speaker_configs=speaker_configs,
+                output_dir=output_dir / "chunks" / f"c{i}",
+            ): i
+            for i, chunk in enumerate(script_chunks)
+        }
+        
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                chunk_results[i] = future.result()
+                logger.info(f"音声生成完了: チャンク {i+1}/{len(script_chunks)}")
+            except Exception as e:
+                logger.error(f"チャンク {i+1} の音声生成に失敗: {e}")
+    
+    return _finish_audio(chunk_results, output_dir)
+
+
+async def build_audio_async(
+    script_path: Path,
+    output_dir: Path,
+    speaker_configs: Optional[Dict[str, str]] = None,
+    script_content: Optional[str] = None,
+) -> Optional[Path]:
+    """
+    音声を生成（非同期版）
+    
+    各チャンクのTTSリクエストを非同期クライアントで並行実行する。
+    同時実行数はAPIのレート制限を考慮して MAX_TTS_CONCURRENCY に制限する。
+    
+    Args:
+        script_path: 台本ファイルのパス
+        output_dir: 出力ディレクトリ
+        speaker_configs: スピーカー設定 {"S1": "Zephyr", "S2": "Puck"}
+        script_content: 読み込み済みの台本（省略時はscript_pathから読み込む）
         
     Returns:
         生成された音声ファイルのパス（失敗時はNone）
     """
+    tts_client, speaker_configs, script_chunks = _prepare_audio(
+        script_path, output_dir, speaker_configs, script_content
+    )
+    
+    semaphore = asyncio.Semaphore(MAX_TTS_CONCURRENCY)
+    
+    async def generate_chunk(i: int, chunk: str) -> List[Path]:
+        async with semaphore:
+            # ファイル名の衝突を避けるため、チャンクごとに出力ディレクトリを分ける
+            audio_files = await tts_client.generate_audio_async(
+                text=chunk,
+                speaker_configs=speaker_configs,
+                output_dir=output_dir / "chunks" / f"c{i}",
+            )
+        logger.info(f"音声生成完了: チャンク {i+1}/{len(script_chunks)}")
+        return audio_files
+    
+    results = await asyncio.gather(
+        *(generate_chunk(i, chunk) for i, chunk in enumerate(script_chunks)),
+        return_exceptions=True,
+    )
+    
+    chunk_results: Dict[int, List[Path]] = {}
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            logger.error(f"チャンク {i+1} の音声生成に失敗: {result}")
+        else:
+            chunk_results[i] = result
+    
+    # 結合・変換はファイル処理が中心のため、イベントループを止めないようスレッドで実行
+    return await asyncio.to_thread(_finish_audio, chunk_results, output_dir)
+
+
+def _prepare_audio(
+    script_path: Path,
+    output_dir: Path,
+    speaker_configs: Optional[Dict[str, str]],
+    script_content: Optional[str],
+) -> Tuple[TTSClient, Dict[str, str], List[str]]:
+    """
+    音声生成の準備（台本の読み込みとTTS用の分割）
+    
+    Returns:
+        (TTSクライアント, スピーカー設定, 台本チャンクのリスト)
+    """
     logger.info(f"音声生成開始: {script_path}")
     
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -36,8 +151,9 @@ def build_audio(
     if speaker_configs is None:
         speaker_configs = {"Speaker 1": "Zephyr", "Speaker 2": "Puck"}
     
-    # 台本の読み込み
-    script_content = script_path.read_text(encoding="utf-8")
+    # 台本の読み込み（呼び出し元で読み込み済みの場合は再利用）
+    if script_content is None:
+        script_content = script_path.read_text(encoding="utf-8")
     
     # TTSクライアントの初期化
     tts_client = TTSClient()
@@ -48,40 +164,49 @@ def build_audio(
     
     logger.info(f"台本を {len(script_chunks)} チャンクに分割しました")
     
-    # 各チャンクで音声生成
-    audio_files = []
-    for i, chunk in enumerate(script_chunks):
-        logger.info(f"音声生成中: チャンク {i+1}/{len(script_chunks)}")
+    return tts_client, speaker_configs, script_chunks
+
+
+def _finish_audio(chunk_results: Dict[int, List[Path]], output_dir: Path) -> Optional[Path]:
+    """
+    チャンクごとの音声ファイルを結合して最終的な音声ファイルを作成
+    
+    Args:
+        chunk_results: チャンク番号ごとの音声ファイルのリスト
+        output_dir: 出力ディレクトリ
         
-        try:
-            chunk_audio_files = tts_client.generate_audio(
-                text=chunk,
-                speaker_configs=speaker_configs,
-                output_dir=output_dir / "chunks",
-            )
-            audio_files.extend(chunk_audio_files)
-        except Exception as e:
-            logger.error(f"チャンク {i+1} の音声生成に失敗: {e}")
-            continue
+    Returns:
+        生成された音声ファイルのパス（失敗時はNone）
+    """
+    # 台本の順序で音声ファイルを並べる
+    audio_files = [
+        audio_file
+        for i in sorted(chunk_results)
+        for audio_file in chunk_results[i]
+    ]
     
     if not audio_files:
         logger.error("音声ファイルが生成されませんでした")
         return None
     
-    # 音声ファイルの結合
-    combined_audio_path = _combine_audio_files(audio_files, output_dir)
-    
-    if combined_audio_path is None:
-        logger.error("音声ファイルの結合に失敗しました")
-        return None
+    # 音声ファイルを結合しながらMP3に変換（結合したWAVファイルも同時に書き出す）
+    final_path = _combine_and_encode(audio_files, output_dir)
     
-    # MP3変換
-    mp3_path = _convert_to_mp3(combined_audio_path, output_dir)
+    if final_path is None:
+        # 音声ファイルの結合
+        combined_audio_path = _combine_audio_files(audio_files, output_dir)
+        
+        if combined_audio_path is None:
+            logger.error("音声ファイルの結合に失敗しました")
+            return None
+        
+        # MP3変換
+        mp3_path = _convert_to_mp3(combined_audio_path, output_dir)
+        final_path = mp3_path if mp3_path else combined_audio_path
     
     # 一時ファイルのクリーンアップ
     _cleanup_temp_files(output_dir / "chunks")
     
-    final_path = mp3_path if mp3_path else combined_audio_path
     logger.info(f"音声生成完了: {final_path}")
     
     return final_path
@@ -101,14 +226,188 @@ def _combine_audio_files(audio_files: List[Path], output_dir: Path) -> Optional[
     if not audio_files:
         return None
     
+    combined_path = output_dir / "podcast.wav"
+    
     if len(audio_files) == 1:
-        # ファイルが1つの場合はコピー
-        combined_path = output_dir / "podcast.wav"
-        combined_path.write_bytes(audio_files[0].read_bytes())
+        # ファイルが1つの場合はハードリンク（できない場合はカーネル内でコピー）
+        combined_path.unlink(missing_ok=True)
+        try:
+            os.link(audio_files[0], combined_path)
+        except OSError:
+            shutil.copyfile(audio_files[0], combined_path)
         return combined_path
     
+    # 全ファイルが同じ形式のWAVであれば、デコードせずPCMデータをそのまま連結
+    try:
+        if _combine_wav_files(audio_files, combined_path):
+            logger.info(f"音声ファイル結合完了: {len(audio_files)} ファイル")
+            return combined_path
+    except Exception as e:
+        logger.warning(f"WAVの直接結合に失敗、pydubで結合します: {e}")
+    
+    return _combine_with_pydub(audio_files, combined_path)
+
+
+def _combine_wav_files(audio_files: List[Path], combined_path: Path) -> bool:
+    """
+    WAVファイルのPCMデータを直接連結
+    
+    Args:
+        audio_files: 音声ファイルのリスト
+        combined_path: 結合後のファイルのパス
+        
+    Returns:
+        結合できた場合True（WAV以外や形式の異なるファイルが含まれる場合はFalse）
+    """
+    params = _common_wav_params(audio_files)
+    if params is None:
+        return False
+    
+    with wave.open(str(combined_path), "wb") as out:
+        out.setparams(params)
+        for audio_file in audio_files:
+            logger.debug(f"音声ファイル結合中: {audio_file}")
+            with wave.open(str(audio_file), "rb") as src:
+                while True:
+                    frames = src.readframes(_COPY_FRAMES)
+                    if not frames:
+                        break
+                    out.writeframesraw(frames)
+    
+    return True
+
+
+def _common_wav_params(audio_files: List[Path]) -> Optional["wave._wave_params"]:
+    """
+    全ファイルに共通するWAVの形式を取得
+    
+    Args:
+        audio_files: 音声ファイルのリスト
+        
+    Returns:
+        先頭ファイルのWAVパラメータ（WAV以外や形式の異なるファイルが含まれる場合はNone）
+    """
+    if any(audio_file.suffix.lower() != ".wav" for audio_file in audio_files):
+        return None
+    
+    # 先頭ファイルの形式を基準にする（フレーム数はファイルごとに異なるため比較しない）
+    with wave.open(str(audio_files[0]), "rb") as first:
+        params = first.getparams()
+    
+    for audio_file in audio_files[1:]:
+        with wave.open(str(audio_file), "rb") as src:
+            if _wav_format(src.getparams()) != _wav_format(params):
+                logger.debug(f"音声形式が異なるファイル: {audio_file}")
+                return None
+    
+    return params
+
+
+def _wav_format(params: "wave._wave_params") -> Tuple[int, int, int, str]:
+    """WAVパラメータのうち、PCMデータをそのまま連結できるかを決める項目"""
+    return params.nchannels, params.sampwidth, params.framerate, params.comptype
+
+
+def _combine_and_encode(audio_files: List[Path], output_dir: Path) -> Optional[Path]:
+    """
+    WAVファイルのPCMデータをFFmpegの標準入力へ直接流してMP3に変換
+    
+    結合したWAVファイル（podcast.wav）は同じPCMデータから並行して書き出し、
+    変換のために読み直す手間を省く。
+    
+    Args:
+        audio_files: 音声ファイルのリスト
+        output_dir: 出力ディレクトリ
+        
+    Returns:
+        MP3ファイルのパス（WAV以外が含まれる場合や変換に失敗した場合はNone）
+    """
+    try:
+        params = _common_wav_params(audio_files)
+    except Exception as e:
+        logger.debug(f"WAV形式の確認に失敗: {e}")
+        return None
+    
+    if params is None or params.sampwidth not in _PCM_FORMATS:
+        return None
+    
+    wav_path = output_dir / "podcast.wav"
+    mp3_path = output_dir / "podcast.mp3"
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-f", _PCM_FORMATS[params.sampwidth],
+        "-ar", str(params.framerate),
+        "-ac", str(params.nchannels),
+        "-i", "-",
+        "-codec:a", "libmp3lame",
+        "-b:a", "192k",
+        "-y",  # 上書き許可
+        str(mp3_path)
+    ]
+    
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        # WAVを結合してからの変換（pydubでの変換を含む）にフォールバック
+        logger.debug("FFmpegが見つかりません")
+        return None
+    
+    try:
+        # フォールバック経路と同じく結合したWAVファイルも残す
+        with wave.open(str(wav_path), "wb") as out:
+            out.setparams(params)
+            for audio_file in audio_files:
+                logger.debug(f"音声ファイル変換中: {audio_file}")
+                with wave.open(str(audio_file), "rb") as src:
+                    while True:
+                        frames = src.readframes(_COPY_FRAMES)
+                        if not frames:
+                            break
+                        out.writeframesraw(frames)
+                        process.stdin.write(frames)
+        
+        _, stderr = process.communicate(timeout=300)  # 5分でタイムアウト
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        logger.warning("FFmpeg変換がタイムアウトしました")
+        mp3_path.unlink(missing_ok=True)
+        return None
+    except Exception as e:
+        process.kill()
+        process.communicate()
+        logger.warning(f"FFmpeg変換でエラー: {e}")
+        mp3_path.unlink(missing_ok=True)
+        return None
+    
+    if process.returncode != 0:
+        logger.warning(f"FFmpeg変換失敗: {stderr.decode('utf-8', errors='replace')}")
+        mp3_path.unlink(missing_ok=True)
+        return None
+    
+    logger.info(f"音声ファイル結合・MP3変換完了: {len(audio_files)} ファイル")
+    return mp3_path
+
+
+def _combine_with_pydub(audio_files: List[Path], combined_path: Path) -> Optional[Path]:
+    """
+    pydubを使用して音声ファイルを結合（形式が混在する場合のフォールバック）
+    
+    Args:
+        audio_files: 音声ファイルのリスト
+        combined_path: 結合後のファイルのパス
+        
+    Returns:
+        結合された音声ファイルのパス
+    """
     try:
-        # pydubを使用して音声ファイルを結合
         combined_audio = AudioSegment.empty()
         
         for audio_file in audio_files:
@@ -126,7 +425,6 @@ def _combine_audio_files(audio_files: List[Path], output_dir: Path) -> Optional[
             combined_audio += audio_segment
         
         # 結合された音声を保存
-        combined_path = output_dir / "podcast.wav"
         combined_audio.export(str(combined_path), format="wav")
         
         logger.info(f"音声ファイル結合完了: {len(audio_files)} ファイル")
@@ -238,7 +536,6 @@ def _cleanup_temp_files(temp_dir: Path) -> None:
     """
     if temp_dir.exists():
         try:
-            import shutil
             shutil.rmtree(temp_dir)
             logger.debug(f"一時ファイルクリーンアップ完了: {temp_dir}")
         except Exception as e:
@@ -1,20 +1,36 @@
 """詳細解説生成モジュール"""
 
 from pathlib import Path
+from typing import List, Optional, TextIO
 
 from learnpod.generator import LLMClient, PromptBuilder
 from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 詳細解説ファイルのヘッダー
+_EXPLANATION_HEADER = """# 詳細解説
 
-def build_explainer(script_path: Path, output_dir: Path) -> Path:
+このドキュメントは、ポッドキャスト台本の内容をより深く理解するための詳細解説です。
+台本で触れられた概念や理論について、背景・根拠・実用例を含めて詳しく説明します。
+
+---
+
+"""
+
+
+def build_explainer(
+    script_path: Path,
+    output_dir: Path,
+    script_content: Optional[str] = None,
+) -> Path:
     """
     詳細解説を生成
     
     Args:
         script_path: 台本ファイルのパス
         output_dir: 出力ディレクトリ
+        script_content: 読み込み済みの台本（省略時はscript_pathから読み込む）
         
     Returns:
         生成された詳細解説ファイルのパス
@@ -23,8 +39,9 @@ def build_explainer(script_path: Path, output_dir: Path) -> Path:
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # 台本の読み込み
-    script_content = script_path.read_text(encoding="utf-8")
+    # 台本の読み込み（呼び出し元で読み込み済みの場合は再利用）
+    if script_content is None:
+        script_content = script_path.read_text(encoding="utf-8")
     
     # LLMクライアントの初期化
     llm_client = LLMClient()
@@ -32,54 +49,131 @@ def build_explainer(script_path: Path, output_dir: Path) -> Path:
     # プロンプトの生成
     prompt = PromptBuilder.build_explainer_prompt(script_content)
     
-    # 詳細解説の生成
-    explanation = llm_client.generate(prompt, temperature=0.5)
-    
-    # 解説の後処理
-    explanation = _post_process_explanation(explanation, script_content)
-    
-    # ファイル保存
+    # 詳細解説の生成（届いたテキストを後処理しながら順次書き込み）
     explainer_path = output_dir / "explanation.md"
-    explainer_path.write_text(explanation, encoding="utf-8")
+    with explainer_path.open("w", encoding="utf-8") as f:
+        writer = _ExplanationWriter(f)
+        for text in llm_client.generate_stream(prompt, temperature=0.5):
+            writer.feed(text)
+        writer.close()
     
     logger.info(f"詳細解説生成完了: {explainer_path}")
     return explainer_path
 
 
-def _post_process_explanation(explanation: str, script_content: str) -> str:
+async def build_explainer_async(
+    script_path: Path,
+    output_dir: Path,
+    script_content: Optional[str] = None,
+) -> Path:
     """
-    詳細解説の後処理
+    詳細解説を生成（非同期版）
     
     Args:
-        explanation: 生成された詳細解説
-        script_content: 台本内容
+        script_path: 台本ファイルのパス
+        output_dir: 出力ディレクトリ
+        script_content: 読み込み済みの台本（省略時はscript_pathから読み込む）
         
     Returns:
-        後処理済みの詳細解説
+        生成された詳細解説ファイルのパス
     """
-    # ヘッダーの追加
-    header = f"""# 詳細解説
-
-このドキュメントは、ポッドキャスト台本の内容をより深く理解するための詳細解説です。
-台本で触れられた概念や理論について、背景・根拠・実用例を含めて詳しく説明します。
-
----
-
-"""
+    logger.info(f"詳細解説生成開始: {script_path}")
     
-    # 解説内容の整形
-    explanation = explanation.strip()
+    output_dir.mkdir(parents=True, exist_ok=True)
     
-    # 不適切な見出しレベルの修正
-    import re
+    # 台本の読み込み（呼び出し元で読み込み済みの場合は再利用）
+    if script_content is None:
+        script_content = script_path.read_text(encoding="utf-8")
     
-    # H1見出しをH2に変更（ドキュメント全体のH1は上記のヘッダーのみ）
-    explanation = re.sub(r'^# ', '## ', explanation, flags=re.MULTILINE)
+    # LLMクライアントの初期化
+    llm_client = LLMClient()
+    
+    # プロンプトの生成
+    prompt = PromptBuilder.build_explainer_prompt(script_content)
     
-    # 引用ブロックの整形
-    explanation = re.sub(r'^>\s*(.+)$', r'> \1', explanation, flags=re.MULTILINE)
+    # 詳細解説の生成（届いたテキストを後処理しながら順次書き込み）
+    explainer_path = output_dir / "explanation.md"
+    with explainer_path.open("w", encoding="utf-8") as f:
+        writer = _ExplanationWriter(f)
+        async for text in llm_client.generate_stream_async(prompt, temperature=0.5):
+            writer.feed(text)
+        writer.close()
     
-    # 空行の整理
-    explanation = re.sub(r'\n{3,}', '\n\n', explanation)
+    logger.info(f"詳細解説生成完了: {explainer_path}")
+    return explainer_path
+
+
+class _ExplanationWriter:
+    """
+    詳細解説を行単位で後処理しながらファイルに書き込むクラス
     
-    return header + explanation 
\ No newline at end of file
+    後処理の内容:
+    - 先頭と末尾の空白行・空白文字の除去
+    - H1見出しをH2に変更（ドキュメント全体のH1はヘッダーのみ）
+    - 引用ブロックの整形（"> " に統一）
+    - 連続する空行を1行にまとめる
+    """
+    
+    def __init__(self, f: TextIO) -> None:
+        """
+        Args:
+            f: 書き込み先のファイル
+        """
+        self._f = f
+        self._partial = ""  # 改行が届いていない行の断片
+        self._started = False  # 最初の非空白行を書き込んだか
+        self._pending_blank: List[str] = []  # 次の非空白行まで保留する空白行
+        self._last_line: Optional[str] = None  # 末尾の空白除去のため保留する行
+        
+        f.write(_EXPLANATION_HEADER)
+    
+    def feed(self, text: str) -> None:
+        """
+        ストリームで届いたテキストを追加
+        
+        Args:
+            text: テキストの断片
+        """
+        *lines, self._partial = (self._partial + text).split("\n")
+        for line in lines:
+            self._add_line(line)
+    
+    def close(self) -> None:
+        """残りのテキストを書き込んで終了（末尾の空白は除去）"""
+        if self._partial:
+            self._add_line(self._partial)
+            self._partial = ""
+        
+        if self._last_line is not None:
+            self._f.write(self._last_line.rstrip())
+            self._last_line = None
+        self._pending_blank = []
+    
+    def _add_line(self, line: str) -> None:
+        """1行分の後処理"""
+        if not line.strip():
+            # 先頭の空白行は捨て、それ以外は次の非空白行まで保留
+            if self._started:
+                # 連続する空行は1行にまとめる
+                if not (line == "" and self._pending_blank and self._pending_blank[-1] == ""):
+                    self._pending_blank.append(line)
+            return
+        
+        if not self._started:
+            line = line.lstrip()
+            self._started = True
+        
+        # H1見出しをH2に変更
+        if line.startswith("# "):
+            line = "#" + line
+        
+        # 引用ブロックの整形
+        if line.startswith(">") and line[1:].strip():
+            line = "> " + line[1:].lstrip()
+        
+        if self._last_line is not None:
+            self._f.write(self._last_line + "\n")
+        for blank in self._pending_blank:
+            self._f.write(blank + "\n")
+        self._pending_blank = []
+        self._last_line = line
@@ -1,22 +1,49 @@
 """Q&A生成モジュール"""
 
+import asyncio
 import re
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 import yaml
 
+try:
+    # libyamlがあればCベースの実装を使う
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
 from learnpod.generator import LLMClient, PromptBuilder
 from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Q&Aの後処理で置き換える箇所
+# コードブロックの開始・終了（前後の改行を含む）と、3行以上の連続改行
+_QA_CLEANUP_RE = re.compile(r'(?:\n*```(?:markdown)?\n?)+\n*|\n{3,}')
+
+# コードブロックの開始・終了
+_MD_FENCE_RE = re.compile(r'```(?:markdown)?\n?')
+_YAML_FENCE_RE = re.compile(r'```(?:yaml)?\n?')
+
+# Keyword Q&Aセクションの見出し
+_KEYWORD_HEADING = "## Keyword Q&A"
+
+# 問題と回答の組
+_QA_PAIR_RE = re.compile(
+    r'\*\*Q\d+:\*\*\s*(.+?)\s*\*\*A:\*\*\s*(.+?)(?=\*\*Q\d+:|$)', re.DOTALL
+)
+
+# HTMLコメント（flashcard IDなど）
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->')
+
 
 def build_questions(
     script_path: Path,
     output_dir: Path,
     total_questions: int = 20,
     ratios: Tuple[float, float, float] = (0.5, 0.4, 0.1),
+    script_content: Optional[str] = None,
 ) -> Tuple[Path, Path]:
     """
     Q&Aセットとフラッシュカードを生成
@@ -26,6 +53,7 @@ def build_questions(
         output_dir: 出力ディレクトリ
         total_questions: 総問題数
         ratios: (Keyword, Why, Open)の比率
+        script_content: 読み込み済みの台本（省略時はscript_pathから読み込む）
         
     Returns:
         (Q&Aファイルのパス, フラッシュカードファイルのパス)
@@ -34,8 +62,9 @@ def build_questions(
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # 台本の読み込み
-    script_content = script_path.read_text(encoding="utf-8")
+    # 台本の読み込み（呼び出し元で読み込み済みの場合は再利用）
+    if script_content is None:
+        script_content = script_path.read_text(encoding="utf-8")
     
     # LLMクライアントの初期化
     llm_client = LLMClient()
@@ -50,15 +79,8 @@ def build_questions(
     # Q&Aの生成
     qa_content = llm_client.generate(qa_prompt, temperature=0.6)
     
-    # Q&Aの後処理
-    qa_content = _post_process_qa(qa_content)
-    
-    # Q&Aファイルの保存
-    qa_path = output_dir / "questions.md"
-    qa_path.write_text(qa_content, encoding="utf-8")
-    
-    # Keyword Q&Aの抽出
-    keyword_qa = _extract_keyword_qa(qa_content)
+    # Q&Aの保存とKeyword Q&Aの抽出
+    qa_path, keyword_qa = _save_qa(qa_content, output_dir)
     
     # フラッシュカードYAMLの生成
     flashcard_path = None
@@ -74,6 +96,67 @@ def build_questions(
     return qa_path, flashcard_path
 
 
+async def build_questions_async(
+    script_path: Path,
+    output_dir: Path,
+    total_questions: int = 20,
+    ratios: Tuple[float, float, float] = (0.5, 0.4, 0.1),
+    script_content: Optional[str] = None,
+) -> Tuple[Path, Path]:
+    """
+    Q&Aセットとフラッシュカードを生成（非同期版）
+    
+    Args:
+        script_path: 台本ファイルのパス
+        output_dir: 出力ディレクトリ
+        total_questions: 総問題数
+        ratios: (Keyword, Why, Open)の比率
+        script_content: 読み込み済みの台本（省略時はscript_pathから読み込む）
+        
+    Returns:
+        (Q&Aファイルのパス, フラッシュカードファイルのパス)
+    """
+    logger.info(f"Q&A生成開始: {script_path}")
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # 台本の読み込み（呼び出し元で読み込み済みの場合は再利用）
+    if script_content is None:
+        script_content = script_path.read_text(encoding="utf-8")
+    
+    # LLMクライアントの初期化
+    llm_client = LLMClient()
+    
+    # Q&Aプロンプトの生成
+    qa_prompt = PromptBuilder.build_qa_prompt(
+        content=script_content,
+        total_questions=total_questions,
+        ratios=ratios,
+    )
+    
+    # Q&Aの生成
+    qa_content = await llm_client.generate_async(qa_prompt, temperature=0.6)
+    
+    # Q&Aの保存とKeyword Q&Aの抽出
+    # ファイル書き込み中も並行実行中の他ステップを止めないようスレッドで実行
+    qa_path, keyword_qa = await asyncio.to_thread(_save_qa, qa_content, output_dir)
+    
+    # フラッシュカードYAMLの生成（Q&Aの結果に依存するため逐次実行）
+    flashcard_path = None
+    if keyword_qa:
+        flashcard_prompt = PromptBuilder.build_flashcard_yaml_prompt(keyword_qa)
+        yaml_content = await llm_client.generate_async(flashcard_prompt, temperature=0.3)
+        flashcard_path = await asyncio.to_thread(
+            _save_flashcard_yaml, yaml_content, keyword_qa, output_dir
+        )
+    
+    logger.info(f"Q&A生成完了: {qa_path}")
+    if flashcard_path:
+        logger.info(f"フラッシュカード生成完了: {flashcard_path}")
+    
+    return qa_path, flashcard_path
+
+
 def _post_process_qa(qa_content: str) -> str:
     """
     Q&Aの後処理
@@ -97,20 +180,24 @@ def _post_process_qa(qa_content: str) -> str:
     # 内容の整形
     qa_content = qa_content.strip()
     
-    # マークダウンコードブロックの除去
-    qa_content = re.sub(r'```markdown\n?', '', qa_content)
-    qa_content = re.sub(r'```\n?', '', qa_content)
-    
-    # 問題番号の整形
-    qa_content = re.sub(r'\*\*Q(\d+):\*\*', r'**Q\1:**', qa_content)
-    qa_content = re.sub(r'\*\*A:\*\*', r'**A:**', qa_content)
-    
-    # 空行の整理
-    qa_content = re.sub(r'\n{3,}', '\n\n', qa_content)
+    # マークダウンコードブロックの除去と空行の整理（1回の走査で行う）
+    qa_content = _QA_CLEANUP_RE.sub(_clean_qa_match, qa_content)
     
     return header + qa_content
 
 
+def _clean_qa_match(match: "re.Match[str]") -> str:
+    """
+    Q&Aの後処理で一致した箇所の置き換え文字列を取得
+    
+    コードブロックの記号を除いた残りの改行のうち、3行以上の連続は2行にまとめる。
+    """
+    text = match.group(0)
+    if "`" in text:
+        text = _MD_FENCE_RE.sub('', text)
+    return text if len(text) < 3 else '\n\n'
+
+
 def _extract_keyword_qa(qa_content: str) -> str:
     """
     Keyword Q&Aセクションを抽出
@@ -121,20 +208,51 @@ def _extract_keyword_qa(qa_content: str) -> str:
     Returns:
         Keyword Q&Aセクション
     """
-    # Keyword Q&Aセクションの抽出
-    keyword_match = re.search(
-        r'## Keyword Q&A\s*\n(.*?)(?=## |$)',
-        qa_content,
-        re.DOTALL
-    )
-    
-    if keyword_match:
-        return keyword_match.group(1).strip()
+    # Keyword Q&Aセクションの抽出（見出しの次の行から、次の "## " の手前まで）
+    start = qa_content.find(_KEYWORD_HEADING)
+    while start >= 0:
+        head_end = start + len(_KEYWORD_HEADING)
+        body_start = head_end
+        while body_start < len(qa_content) and qa_content[body_start].isspace():
+            body_start += 1
+        
+        # 見出しと同じ行に他の文字が続く場合は見出しとみなさない
+        if "\n" in qa_content[head_end:body_start]:
+            end = qa_content.find("## ", body_start)
+            if end < 0:
+                end = len(qa_content)
+            return qa_content[body_start:end].strip()
+        
+        start = qa_content.find(_KEYWORD_HEADING, head_end)
     
     logger.warning("Keyword Q&Aセクションが見つかりませんでした")
     return ""
 
 
+def _save_qa(qa_content: str, output_dir: Path) -> Tuple[Path, str]:
+    """
+    Q&Aを後処理して保存
+    
+    Args:
+        qa_content: 生成されたQ&A内容
+        output_dir: 出力ディレクトリ
+        
+    Returns:
+        (Q&Aファイルのパス, Keyword Q&Aセクション)
+    """
+    # Q&Aの後処理
+    qa_content = _post_process_qa(qa_content)
+    
+    # Q&Aファイルの保存
+    qa_path = output_dir / "questions.md"
+    qa_path.write_text(qa_content, encoding="utf-8")
+    
+    # Keyword Q&Aの抽出
+    keyword_qa = _extract_keyword_qa(qa_content)
+    
+    return qa_path, keyword_qa
+
+
 def _generate_flashcard_yaml(
     keyword_qa: str, output_dir: Path, llm_client: LLMClient
 ) -> Path:
@@ -155,22 +273,36 @@ def _generate_flashcard_yaml(
     # フラッシュカードYAMLの生成
     yaml_content = llm_client.generate(flashcard_prompt, temperature=0.3)
     
+    return _save_flashcard_yaml(yaml_content, keyword_qa, output_dir)
+
+
+def _save_flashcard_yaml(yaml_content: str, keyword_qa: str, output_dir: Path) -> Path:
+    """
+    フラッシュカードYAMLを後処理・検証して保存
+    
+    Args:
+        yaml_content: 生成されたYAML内容
+        keyword_qa: Keyword Q&Aセクション（フォールバック生成用）
+        output_dir: 出力ディレクトリ
+        
+    Returns:
+        フラッシュカードファイルのパス
+    """
     # YAMLの後処理
     yaml_content = _post_process_yaml(yaml_content)
     
-    # ファイル保存
-    flashcard_path = output_dir / "flashcards.yaml"
-    flashcard_path.write_text(yaml_content, encoding="utf-8")
-    
-    # YAML形式の検証
+    # YAML形式の検証（保存前に行い、ファイルは1回だけ書き込む）
     try:
-        yaml.safe_load(yaml_content)
+        yaml.load(yaml_content, Loader=_YamlLoader)
         logger.debug("フラッシュカードYAMLの形式検証成功")
     except yaml.YAMLError as e:
         logger.warning(f"フラッシュカードYAMLの形式に問題があります: {e}")
         # 手動でフラッシュカードを生成
         yaml_content = _generate_fallback_yaml(keyword_qa)
-        flashcard_path.write_text(yaml_content, encoding="utf-8")
+    
+    # ファイル保存
+    flashcard_path = output_dir / "flashcards.yaml"
+    flashcard_path.write_text(yaml_content, encoding="utf-8")
     
     return flashcard_path
 
@@ -186,22 +318,17 @@ def _post_process_yaml(yaml_content: str) -> str:
         後処理済みのYAML
     """
     # YAMLコードブロックの除去
-    yaml_content = re.sub(r'```yaml\n?', '', yaml_content)
-    yaml_content = re.sub(r'```\n?', '', yaml_content)
-    
-    # 不要な説明文の除去
-    lines = yaml_content.split('\n')
-    yaml_lines = []
-    in_yaml = False
+    yaml_content = _YAML_FENCE_RE.sub('', yaml_content)
     
-    for line in lines:
-        if line.strip().startswith('flashcards:'):
-            in_yaml = True
-        
-        if in_yaml:
-            yaml_lines.append(line)
+    # 不要な説明文の除去（行頭の "flashcards:" より前を捨てる）
+    start = yaml_content.find('flashcards:')
+    while start >= 0:
+        line_start = yaml_content.rfind('\n', 0, start) + 1
+        if not yaml_content[line_start:start].strip():
+            return yaml_content[line_start:].strip()
+        start = yaml_content.find('flashcards:', start + 1)
     
-    return '\n'.join(yaml_lines).strip()
+    return ''
 
 
 def _generate_fallback_yaml(keyword_qa: str) -> str:
@@ -217,15 +344,14 @@ def _generate_fallback_yaml(keyword_qa: str) -> str:
     flashcards = []
     
     # Q&Aの解析
-    qa_pattern = r'\*\*Q\d+:\*\*\s*(.+?)\s*\*\*A:\*\*\s*(.+?)(?=\*\*Q\d+:|$)'
-    matches = re.findall(qa_pattern, keyword_qa, re.DOTALL)
+    matches = _QA_PAIR_RE.findall(keyword_qa)
     
     for i, (question, answer) in enumerate(matches):
         question = question.strip()
         answer = answer.strip()
         
         # flashcard IDコメントを除去
-        answer = re.sub(r'<!--.*?-->', '', answer).strip()
+        answer = _HTML_COMMENT_RE.sub('', answer).strip()
         
         flashcard = {
             'id': f'keyword_{i+1:02d}',
@@ -236,4 +362,6 @@ def _generate_fallback_yaml(keyword_qa: str) -> str:
         flashcards.append(flashcard)
     
     yaml_data = {'flashcards': flashcards}
-    return yaml.dump(yaml_data, allow_unicode=True, default_flow_style=False) 
\ No newline at end of file
+    return yaml.dump(
+        yaml_data, Dumper=_YamlDumper, allow_unicode=True, default_flow_style=False
+    ) 
\ No newline at end of file
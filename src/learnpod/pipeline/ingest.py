@@ -1,16 +1,32 @@
 """Markdown取り込みモジュール"""
 
+import functools
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import yaml
 
+try:
+    # libyamlがあればCベースの実装を使う
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# YAML Front-Matter
+_FRONT_MATTER_RE = re.compile(r'^---\n(.*?)\n---\n', re.DOTALL)
+# 最初のH1見出し
+_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+# H1見出しを探す範囲（文書の先頭からの文字数）
+_TITLE_SEARCH_CHARS = 4096
+# 見出しパターン（H1-H3、全文に対して行単位で走査するため空白に改行を含めない）
+_HEADING_RE = re.compile(r'^(#{1,3})[^\S\n]+(.+)$', re.MULTILINE)
+
 
 @dataclass
 class IngestedDoc:
@@ -20,24 +36,39 @@ class IngestedDoc:
     raw_md: str
     sections: List[Dict[str, str]]
     metadata: Optional[Dict] = None
+    # 本文の開始位置（YAML Front-Matterの直後、取り込み時に設定）
+    body_start: int = field(default=0, repr=False)
     
-    def get_content_without_metadata(self) -> str:
-        """メタデータを除いたコンテンツを取得"""
+    @functools.cached_property
+    def content_without_metadata(self) -> str:
+        """メタデータを除いたコンテンツ（初回アクセス時に計算してキャッシュ）"""
         if self.metadata:
+            if self.body_start:
+                # 取り込み時に求めた位置で切り出す（正規表現で再走査しない）
+                return self.raw_md[self.body_start:].strip()
             # YAML Front-Matterを除去
-            content = re.sub(r'^---\n.*?\n---\n', '', self.raw_md, flags=re.DOTALL)
+            content = _FRONT_MATTER_RE.sub('', self.raw_md)
             return content.strip()
         return self.raw_md
     
+    @functools.cached_property
+    def total_word_count(self) -> int:
+        """総語数（概算、初回アクセス時に計算してキャッシュ）"""
+        content = self.content_without_metadata
+        # 日本語の場合、文字数を語数として概算（空白と改行を除いた文字数をコピーせずに数える）
+        return len(content) - content.count(" ") - content.count("\n")
+    
+    def get_content_without_metadata(self) -> str:
+        """メタデータを除いたコンテンツを取得"""
+        return self.content_without_metadata
+    
     def get_section_by_level(self, level: int) -> List[Dict[str, str]]:
         """指定レベルのセクションを取得"""
         return [s for s in self.sections if s["level"] == level]
     
     def get_total_word_count(self) -> int:
         """総語数を取得（概算）"""
-        content = self.get_content_without_metadata()
-        # 日本語の場合、文字数を語数として概算
-        return len(content.replace(" ", "").replace("\n", ""))
+        return self.total_word_count
 
 
 def ingest_markdown(file_path: Path) -> IngestedDoc:
@@ -60,7 +91,7 @@ def ingest_markdown(file_path: Path) -> IngestedDoc:
     if file_path.suffix.lower() != ".md":
         raise ValueError(f"Markdownファイルではありません: {file_path}")
     
-    logger.info(f"Markdown取り込み開始: {file_path}")
+    logger.info("Markdown取り込み開始: %s", file_path)
     
     # ファイル内容の読み込み
     try:
@@ -73,15 +104,17 @@ def ingest_markdown(file_path: Path) -> IngestedDoc:
     
     # YAML Front-Matterの解析
     metadata = None
+    body_start = 0
     if content.startswith("---\n"):
         try:
-            yaml_match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
+            yaml_match = _FRONT_MATTER_RE.match(content)
             if yaml_match:
+                body_start = yaml_match.end()
                 yaml_content = yaml_match.group(1)
-                metadata = yaml.safe_load(yaml_content)
-                logger.debug(f"YAML Front-Matter解析完了: {metadata}")
+                metadata = yaml.load(yaml_content, Loader=_YamlLoader)
+                logger.debug("YAML Front-Matter解析完了: %s", metadata)
         except yaml.YAMLError as e:
-            logger.warning(f"YAML Front-Matter解析失敗: {e}")
+            logger.warning("YAML Front-Matter解析失敗: %s", e)
     
     # タイトルの抽出
     title = _extract_title(content, metadata, file_path)
@@ -94,11 +127,14 @@ def ingest_markdown(file_path: Path) -> IngestedDoc:
         raw_md=content,
         sections=sections,
         metadata=metadata,
+        body_start=body_start,
     )
     
     logger.info(
-        f"Markdown取り込み完了: タイトル='{title}', "
-        f"セクション数={len(sections)}, 語数={doc.get_total_word_count()}"
+        "Markdown取り込み完了: タイトル='%s', セクション数=%d, 語数=%d",
+        title,
+        len(sections),
+        doc.get_total_word_count(),
     )
     
     return doc
@@ -110,8 +146,13 @@ def _extract_title(content: str, metadata: Optional[Dict], file_path: Path) -> s
     if metadata and "title" in metadata:
         return str(metadata["title"])
     
-    # 2. 最初のH1見出しを取得
-    h1_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+    # 2. 最初のH1見出しを取得（見出しは通常冒頭にあるため先頭付近を優先して探す）
+    h1_match = _H1_RE.search(content, 0, _TITLE_SEARCH_CHARS)
+    if h1_match is not None:
+        # 範囲の境界をまたぐ見出しも途切れないよう、見つけた位置から全体に対して照合し直す
+        h1_match = _H1_RE.match(content, h1_match.start())
+    if h1_match is None and len(content) > _TITLE_SEARCH_CHARS:
+        h1_match = _H1_RE.search(content)
     if h1_match:
         return h1_match.group(1).strip()
     
@@ -123,41 +164,15 @@ def _extract_sections(content: str) -> List[Dict[str, str]]:
     """セクションを抽出"""
     sections = []
     
-    # 見出しパターン（H1-H3）
-    heading_pattern = r'^(#{1,3})\s+(.+)$'
-    
-    lines = content.split('\n')
-    current_section = None
-    current_content = []
-    
-    for line in lines:
-        heading_match = re.match(heading_pattern, line)
-        
-        if heading_match:
-            # 前のセクションを保存
-            if current_section:
-                current_section["content"] = '\n'.join(current_content).strip()
-                sections.append(current_section)
-            
-            # 新しいセクションを開始
-            level = len(heading_match.group(1))
-            title = heading_match.group(2).strip()
-            
-            current_section = {
-                "level": level,
-                "title": title,
-                "content": "",
-            }
-            current_content = []
-        else:
-            # セクション内容を蓄積
-            if current_section:
-                current_content.append(line)
-    
-    # 最後のセクションを保存
-    if current_section:
-        current_section["content"] = '\n'.join(current_content).strip()
-        sections.append(current_section)
+    # 見出し行だけを全文から直接走査し、本文は次の見出しまでをスライスで切り出す
+    matches = list(_HEADING_RE.finditer(content))
+    for i, heading_match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        sections.append({
+            "level": len(heading_match.group(1)),
+            "title": heading_match.group(2).strip(),
+            "content": content[heading_match.end():end].strip(),
+        })
     
     # セクションがない場合、全体を1つのセクションとして扱う
     if not sections:
@@ -167,5 +182,5 @@ def _extract_sections(content: str) -> List[Dict[str, str]]:
             "content": content,
         })
     
-    logger.debug(f"セクション抽出完了: {len(sections)} セクション")
+    logger.debug("セクション抽出完了: %d セクション", len(sections))
     return sections 
\ No newline at end of file
@@ -1,15 +1,20 @@
 """パイプライン統括モジュール"""
 
+import asyncio
+import json
+import shutil
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
 from learnpod.config import config
-from learnpod.email import send_email
-from learnpod.pipeline.build_audio import build_audio
-from learnpod.pipeline.build_explainer import build_explainer
-from learnpod.pipeline.build_questions import build_questions
+from learnpod.email import SMTPSession, send_email
+from learnpod.generator._client import aclose_genai_client
+from learnpod.pipeline.build_audio import build_audio_async
+from learnpod.pipeline.build_explainer import build_explainer_async
+from learnpod.pipeline.build_questions import build_questions_async
 from learnpod.pipeline.build_script import build_script
 from learnpod.pipeline.ingest import IngestedDoc, ingest_markdown
+from learnpod.utils.audio import get_audio_duration
 from learnpod.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -38,6 +43,7 @@ class PipelineOrchestrator:
         voice_map: Optional[Dict[str, str]] = None,
         send_mail: bool = True,
         timestamp: Optional[str] = None,
+        smtp_session: Optional[SMTPSession] = None,
     ) -> Path:
         """
         フルパイプラインを実行
@@ -50,15 +56,15 @@ class PipelineOrchestrator:
             voice_map: 音声マッピング
             send_mail: メール送信フラグ
             timestamp: タイムスタンプ（出力ディレクトリ用）
+            smtp_session: 複数回の実行で共有するSMTPセッション
             
         Returns:
             出力ディレクトリのパス
         """
-        logger.info(f"フルパイプライン開始: {input_file}")
+        logger.info("フルパイプライン開始: %s", input_file)
         
-        # 出力ディレクトリの準備
+        # 出力ディレクトリの準備（作成済みのディレクトリが返る）
         self.output_dir = config.get_output_dir(timestamp)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
         
         try:
             # 1. Markdown取り込み
@@ -67,27 +73,28 @@ class PipelineOrchestrator:
             # 2. 台本生成
             script_path = self.build_script_step(language, target_length, speakers)
             
-            # 3. 詳細解説生成
-            explanation_path = self.build_explainer_step(script_path)
+            # 台本は以降のステップで共有するため1回だけ読み込む
+            script_content = script_path.read_text(encoding="utf-8")
             
-            # 4. Q&A生成
-            qa_path, flashcard_path = self.build_questions_step(script_path)
-            
-            # 5. 音声生成
-            audio_path = self.build_audio_step(script_path, voice_map)
+            # 3-5. 詳細解説・Q&A・音声を並行生成
+            # 非同期クライアントの接続はイベントループに紐づくため、1つのループ内で実行する
+            # （クライアントはループごとに作られ、ループの終了前に閉じる）
+            explanation_path, (qa_path, flashcard_path), audio_path = asyncio.run(
+                self._build_from_script(script_path, script_content, voice_map)
+            )
             
             # 6. メール送信
             if send_mail:
-                self.send_email_step()
+                self.send_email_step(smtp_session)
             
             # 実行サマリーの出力
             self._print_summary()
             
-            logger.info(f"フルパイプライン完了: {self.output_dir}")
+            logger.info("フルパイプライン完了: %s", self.output_dir)
             return self.output_dir
             
         except Exception as e:
-            logger.error(f"パイプライン実行中にエラーが発生: {e}")
+            logger.error("パイプライン実行中にエラーが発生: %s", e)
             raise
     
     def ingest_step(self, input_file: Path) -> IngestedDoc:
@@ -96,9 +103,9 @@ class PipelineOrchestrator:
         
         doc = ingest_markdown(input_file)
         
-        # 入力ファイルのコピー
+        # 入力ファイルのコピー（取り込み済みの文字列を再エンコードせずファイル間で直接コピー）
         input_copy = self.output_dir / f"input_{input_file.name}"
-        input_copy.write_text(doc.raw_md, encoding="utf-8")
+        shutil.copyfile(input_file, input_copy)
         
         return doc
     
@@ -122,55 +129,81 @@ class PipelineOrchestrator:
         self.results["script"] = script_path
         return script_path
     
-    def build_explainer_step(self, script_path: Path) -> Path:
+    async def build_explainer_step_async(
+        self, script_path: Path, script_content: Optional[str] = None
+    ) -> Path:
         """詳細解説生成ステップ"""
         logger.info("ステップ 3/6: 詳細解説生成")
         
-        explanation_path = build_explainer(
+        explanation_path = await build_explainer_async(
             script_path=script_path,
             output_dir=self.output_dir,
+            script_content=script_content,
         )
         
         self.results["explanation"] = explanation_path
         return explanation_path
     
-    def build_questions_step(self, script_path: Path) -> Tuple[Path, Optional[Path]]:
+    async def build_questions_step_async(
+        self, script_path: Path, script_content: Optional[str] = None
+    ) -> Tuple[Path, Optional[Path]]:
         """Q&A生成ステップ"""
         logger.info("ステップ 4/6: Q&A生成")
         
-        qa_path, flashcard_path = build_questions(
+        qa_path, flashcard_path = await build_questions_async(
             script_path=script_path,
             output_dir=self.output_dir,
+            script_content=script_content,
         )
         
         self.results["questions"] = qa_path
         self.results["flashcards"] = flashcard_path
         return qa_path, flashcard_path
     
-    def build_audio_step(
+    async def _build_from_script(
         self,
         script_path: Path,
+        script_content: str,
         voice_map: Optional[Dict[str, str]],
+    ) -> Tuple[Path, Tuple[Path, Optional[Path]], Optional[Path]]:
+        """台本から詳細解説・Q&A・音声を並行生成（いずれも台本のみに依存）"""
+        try:
+            explanation_path, questions_result, audio_path = await asyncio.gather(
+                self.build_explainer_step_async(script_path, script_content),
+                self.build_questions_step_async(script_path, script_content),
+                self.build_audio_step_async(script_path, voice_map, script_content),
+            )
+        finally:
+            # このループ用のクライアントの接続を閉じる（次回の実行は新しいループで行うため）
+            await aclose_genai_client()
+        return explanation_path, questions_result, audio_path
+    
+    async def build_audio_step_async(
+        self,
+        script_path: Path,
+        voice_map: Optional[Dict[str, str]],
+        script_content: Optional[str] = None,
     ) -> Optional[Path]:
         """音声生成ステップ"""
         logger.info("ステップ 5/6: 音声生成")
         
         try:
-            audio_path = build_audio(
+            audio_path = await build_audio_async(
                 script_path=script_path,
                 output_dir=self.output_dir,
                 speaker_configs=voice_map,
+                script_content=script_content,
             )
             
             self.results["audio"] = audio_path
             return audio_path
             
         except Exception as e:
-            logger.error(f"音声生成に失敗: {e}")
+            logger.error("音声生成に失敗: %s", e)
             logger.info("音声生成をスキップして続行します")
             return None
     
-    def send_email_step(self) -> bool:
+    def send_email_step(self, smtp_session: Optional[SMTPSession] = None) -> bool:
         """メール送信ステップ"""
         logger.info("ステップ 6/6: メール送信")
         
@@ -183,45 +216,37 @@ class PipelineOrchestrator:
                 explanation_path=self.results["explanation"],
                 qa_path=self.results["questions"],
                 flashcard_path=self.results["flashcards"],
+                session=smtp_session,
             )
             
             return success
             
         except Exception as e:
-            logger.error(f"メール送信に失敗: {e}")
+            logger.error("メール送信に失敗: %s", e)
             return False
     
     def _print_summary(self) -> None:
-        """実行サマリーを出力"""
-        logger.info("=" * 50)
-        logger.info("パイプライン実行サマリー")
-        logger.info("=" * 50)
-        logger.info(f"タイトル: {self.doc.title}")
-        logger.info(f"出力ディレクトリ: {self.output_dir}")
-        logger.info("")
-        logger.info("生成されたファイル:")
-        
+        """実行サマリーを1件の構造化ログ（JSON）として出力"""
+        files: Dict[str, Optional[Dict[str, object]]] = {}
         for step_name, file_path in self.results.items():
             if file_path and file_path.exists():
-                file_size = file_path.stat().st_size
-                size_mb = file_size / (1024 * 1024)
-                
+                file_info: Dict[str, object] = {
+                    "path": file_path.name,
+                    "size_mb": round(file_path.stat().st_size / (1024 * 1024), 1),
+                }
                 if step_name == "audio":
-                    # 音声ファイルの場合は時間も表示
-                    try:
-                        from pydub import AudioSegment
-                        audio = AudioSegment.from_file(str(file_path))
-                        duration_seconds = len(audio) / 1000
-                        minutes = int(duration_seconds // 60)
-                        seconds = int(duration_seconds % 60)
-                        logger.info(f"  ✅ {step_name}: {file_path.name} ({size_mb:.1f}MB, {minutes}:{seconds:02d})")
-                    except Exception:
-                        logger.info(f"  ✅ {step_name}: {file_path.name} ({size_mb:.1f}MB)")
-                else:
-                    logger.info(f"  ✅ {step_name}: {file_path.name} ({size_mb:.1f}MB)")
+                    # 音声ファイルの場合は時間も記録（デコードせずにメタデータから取得）
+                    duration_seconds = get_audio_duration(file_path)
+                    if duration_seconds is not None:
+                        file_info["duration_s"] = round(duration_seconds, 1)
+                files[step_name] = file_info
             else:
-                logger.info(f"  ❌ {step_name}: 生成されませんでした")
+                # 生成されなかったファイル
+                files[step_name] = None
         
-        logger.info("")
-        logger.info("パイプライン実行完了！")
-        logger.info("=" * 50) 
\ No newline at end of file
+        summary = {
+            "title": self.doc.title,
+            "output_dir": str(self.output_dir),
+            "files": files,
+        }
+        logger.info("パイプライン実行サマリー: %s", json.dumps(summary, ensure_ascii=False))
@@ -1,5 +1,6 @@
 """ユーティリティモジュール"""
 
+from .audio import get_audio_duration
 from .logger import get_logger
 
-__all__ = ["get_logger"] 
\ No newline at end of file
+__all__ = ["get_audio_duration", "get_logger"]
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""音声ファイルユーティリティモジュール"""
+
+import subprocess
+import wave
+from pathlib import Path
+from typing import Optional
+
+from learnpod.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_audio_duration(audio_path: Path) -> Optional[float]:
+    """
+    音声ファイルの長さを取得（デコードせずにメタデータのみ参照）
+    
+    WAVはヘッダーから、それ以外の形式はffprobeで取得する。
+    
+    Args:
+        audio_path: 音声ファイルのパス
+        
+    Returns:
+        音声の長さ（秒）。取得できない場合はNone
+    """
+    if audio_path.suffix.lower() == ".wav":
+        try:
+            with wave.open(str(audio_path), "rb") as wav_file:
+                return wav_file.getnframes() / wav_file.getframerate()
+        except (wave.Error, EOFError, OSError) as e:
+            logger.debug(f"WAVヘッダーの読み込みに失敗、ffprobeを使用: {e}")
+    
+    return _probe_duration(audio_path)
+
+
+def _probe_duration(audio_path: Path) -> Optional[float]:
+    """
+    ffprobeでコンテナのメタデータから音声の長さを取得
+    
+    Args:
+        audio_path: 音声ファイルのパス
+        
+    Returns:
+        音声の長さ（秒）。取得できない場合はNone
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=nw=1:nk=1",
+        str(audio_path),
+    ]
+    
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"ffprobeの実行に失敗: {e}")
+        return None
+    
+    if result.returncode != 0:
+        logger.debug(f"ffprobeが失敗しました: {result.stderr}")
+        return None
+    
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
@@ -0,0 +1,112 @@
+"""LLMレスポンスキャッシュモジュール"""
+
+import functools
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from learnpod.config import config
+from learnpod.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMCache:
+    """
+    生成条件の完全一致で引くLLMレスポンスキャッシュ
+    
+    キーは (モデル, 温度, 最大出力トークン数, プロンプト) のSHA-256で、
+    1キーにつき1ファイル（<key>.txt）として保存する。有効期限は更新日時で判定する。
+    """
+    
+    def __init__(self, cache_dir: Path, ttl: int, enabled: bool = True) -> None:
+        """
+        Args:
+            cache_dir: キャッシュファイルの保存先ディレクトリ
+            ttl: 有効期限（秒）
+            enabled: Falseの場合は読み書きを行わない
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.enabled = enabled
+    
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: float,
+        prompt: str,
+        max_output_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        生成条件からキャッシュキーを算出
+        
+        Args:
+            model: モデル名
+            temperature: 生成の創造性
+            prompt: 入力プロンプト
+            max_output_tokens: 最大出力トークン数
+            
+        Returns:
+            キャッシュキー（SHA-256の16進文字列）
+        """
+        key = f"{model}|{temperature}|{max_output_tokens}|{prompt}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        キャッシュ済みのレスポンスを読み込み
+        
+        Args:
+            key: キャッシュキー
+            
+        Returns:
+            キャッシュされたテキスト（未キャッシュ・期限切れ・キャッシュ無効の場合はNone）
+        """
+        if not self.enabled:
+            return None
+        
+        cache_path = self._path(key)
+        try:
+            age = time.time() - cache_path.stat().st_mtime
+            if age > self.ttl:
+                return None
+            text = cache_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        
+        logger.info(f"LLMキャッシュヒット: {key[:12]}")
+        return text
+    
+    def set(self, key: str, text: str) -> None:
+        """
+        レスポンスをキャッシュに保存（失敗しても生成結果には影響させない）
+        
+        Args:
+            key: キャッシュキー
+            text: 生成されたテキスト
+        """
+        if not self.enabled:
+            return
+        
+        cache_path = self._path(key)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # 並行実行時に書き込み途中のファイルを読まないよう一時ファイル経由で置き換え
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"LLMキャッシュの保存に失敗: {e}")
+    
+    def _path(self, key: str) -> Path:
+        """キャッシュキーに対応するファイルのパス"""
+        return self.cache_dir / f"{key}.txt"
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_cache() -> LLMCache:
+    """プロセス内で共有するLLMレスポンスキャッシュを取得"""
+    return LLMCache(config.llm_cache_dir, config.llm_cache_ttl, config.llm_cache_enabled)
@@ -2,48 +2,54 @@
 
 import logging
 import sys
+import time
 from typing import Optional
 
+# ログの出力形式
+_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _Formatter(logging.Formatter):
+    """同じ秒のレコードでは時刻文字列を再計算しないフォーマッター"""
+    
+    def __init__(self) -> None:
+        super().__init__(fmt=_LOG_FORMAT, datefmt=_DATE_FORMAT)
+        # (秒, 時刻文字列) の組で保持し、スレッド間でも一度に置き換える
+        self._time_cache = (None, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        # 出力形式は秒単位のため、同じ秒の間はstrftimeの結果を使い回す
+        second = int(record.created)
+        cached_second, cached_time = self._time_cache
+        if second == cached_second:
+            return cached_time
+        
+        formatted = time.strftime(datefmt or _DATE_FORMAT, self.converter(second))
+        self._time_cache = (second, formatted)
+        return formatted
+
 
 def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
     ロガーを取得
     
+    ハンドラーはルートロガーにのみ設定し、各ロガーの出力はルートに伝播させる。
+    ルートロガーが未設定の場合は既定の設定（INFO）で初期化する。
+    
     Args:
         name: ロガー名
-        level: ログレベル（DEBUG, INFO, WARNING, ERROR, CRITICAL）
+        level: ログレベル（DEBUG, INFO, WARNING, ERROR, CRITICAL、省略時はルートに従う）
         
     Returns:
-        設定済みのロガー
+        ロガー
     """
-    logger = logging.getLogger(name)
-    
-    # 既に設定済みの場合はそのまま返す
-    if logger.handlers:
-        return logger
-    
-    # ログレベルの設定
-    if level is None:
-        level = "INFO"
+    if not logging.getLogger().handlers:
+        setup_logging()
     
-    logger.setLevel(getattr(logging, level.upper()))
-    
-    # コンソールハンドラーの設定
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, level.upper()))
-    
-    # フォーマッターの設定
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    console_handler.setFormatter(formatter)
-    
-    # ハンドラーをロガーに追加
-    logger.addHandler(console_handler)
-    
-    # 親ロガーへの伝播を防ぐ
-    logger.propagate = False
+    logger = logging.getLogger(name)
+    if level is not None:
+        logger.setLevel(getattr(logging, level.upper()))
     
     return logger
 
@@ -52,16 +58,19 @@ def setup_logging(level: str = "INFO") -> None:
     """
     アプリケーション全体のログ設定
     
+    ルートロガーに1つだけハンドラーを設定する。get_logger による既定の設定が
+    先に行われている場合も、指定したレベルで設定し直す。
+    
     Args:
         level: ログレベル
     """
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(_Formatter())
+    
     logging.basicConfig(
         level=getattr(logging, level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[console_handler],
+        force=True,
     )
     
     # 外部ライブラリのログレベルを調整
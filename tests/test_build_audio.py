@@ -0,0 +1,97 @@
+"""音声生成モジュールのテスト"""
+
+import wave
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pydub")
+pytest.importorskip("google.genai")
+
+from learnpod.pipeline import build_audio  # noqa: E402
+
+
+def _write_wav(path: Path, frames: bytes, framerate: int = 24000) -> Path:
+    """16bitモノラルのWAVファイルを作成"""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(frames)
+    return path
+
+
+def test_combine_wav_files_with_different_lengths(tmp_path: Path) -> None:
+    """長さの異なる同一形式のWAVはPCMデータをそのまま連結できる"""
+    first = _write_wav(tmp_path / "a.wav", b"\x01\x00" * 24000)
+    second = _write_wav(tmp_path / "b.wav", b"\x02\x00" * 36000)
+    
+    assert build_audio._common_wav_params([first, second]) is not None
+    
+    combined_path = tmp_path / "combined.wav"
+    assert build_audio._combine_wav_files([first, second], combined_path)
+    
+    with wave.open(str(combined_path), "rb") as combined:
+        assert combined.getnframes() == 60000
+        assert combined.getframerate() == 24000
+        assert combined.readframes(60000) == b"\x01\x00" * 24000 + b"\x02\x00" * 36000
+
+
+def test_common_wav_params_rejects_different_formats(tmp_path: Path) -> None:
+    """サンプルレートの異なるWAVは直接連結しない"""
+    first = _write_wav(tmp_path / "a.wav", b"\x00\x00" * 100, framerate=24000)
+    second = _write_wav(tmp_path / "b.wav", b"\x00\x00" * 100, framerate=16000)
+    
+    assert build_audio._common_wav_params([first, second]) is None
+
+
+class _FakeFFmpeg:
+    """標準入力に書き込まれたPCMデータを記録するFFmpegプロセスの代替"""
+    
+    def __init__(self, cmd, stdin=None, stdout=None, stderr=None) -> None:
+        self.cmd = cmd
+        self.stdin = self
+        self.returncode = 0
+        self.data = bytearray()
+        _FakeFFmpeg.last = self
+    
+    def write(self, data: bytes) -> int:
+        self.data += data
+        return len(data)
+    
+    def communicate(self, timeout=None):
+        Path(self.cmd[-1]).write_bytes(b"mp3")
+        return b"", b""
+    
+    def kill(self) -> None:
+        pass
+
+
+def test_combine_and_encode_pipes_pcm_of_all_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """複数チャンクのPCMデータがWAV結合時と同じ内容でFFmpegに渡される"""
+    first = _write_wav(tmp_path / "a.wav", b"\x01\x00" * 24000)
+    second = _write_wav(tmp_path / "b.wav", b"\x02\x00" * 36000)
+    monkeypatch.setattr(build_audio.subprocess, "Popen", _FakeFFmpeg)
+    
+    mp3_path = build_audio._combine_and_encode([first, second], tmp_path)
+    
+    assert mp3_path == tmp_path / "podcast.mp3"
+    ffmpeg = _FakeFFmpeg.last
+    assert ffmpeg.cmd[ffmpeg.cmd.index("-f") + 1] == "s16le"
+    assert ffmpeg.cmd[ffmpeg.cmd.index("-ar") + 1] == "24000"
+    assert ffmpeg.cmd[ffmpeg.cmd.index("-ac") + 1] == "1"
+    
+    # フォールバック経路（WAVを結合してから変換）と同じPCMデータであること
+    combined_path = tmp_path / "combined.wav"
+    assert build_audio._combine_wav_files([first, second], combined_path)
+    with wave.open(str(combined_path), "rb") as combined:
+        expected_params = combined.getparams()
+        expected = combined.readframes(combined.getnframes())
+    assert bytes(ffmpeg.data) == expected
+    
+    # フォールバック経路と同じく結合したWAVファイルも書き出される
+    with wave.open(str(tmp_path / "podcast.wav"), "rb") as podcast:
+        assert podcast.getparams() == expected_params
+        assert podcast.readframes(podcast.getnframes()) == expected
@@ -0,0 +1,64 @@
+"""詳細解説生成モジュールのテスト"""
+
+import io
+from typing import List
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from learnpod.pipeline.build_explainer import (  # noqa: E402
+    _EXPLANATION_HEADER,
+    _ExplanationWriter,
+)
+
+_RAW = (
+    "\n \n  # はじめに\n"
+    "本文1\n\n\n\n"
+    ">引用です\n"
+    ">   二つ目の引用\n"
+    "## 小見出し\n"
+    "# 次の章\n"
+    "本文2   \n\n"
+)
+
+_EXPECTED = (
+    "## はじめに\n"
+    "本文1\n\n"
+    "> 引用です\n"
+    "> 二つ目の引用\n"
+    "## 小見出し\n"
+    "## 次の章\n"
+    "本文2"
+)
+
+
+def _write(chunks: List[str]) -> str:
+    f = io.StringIO()
+    writer = _ExplanationWriter(f)
+    for chunk in chunks:
+        writer.feed(chunk)
+    writer.close()
+    return f.getvalue()
+
+
+def test_writer_cleans_up_whole_text() -> None:
+    """一括で渡したテキストを整形してヘッダーの後に書き込む"""
+    assert _write([_RAW]) == _EXPLANATION_HEADER + _EXPECTED
+
+
+@pytest.mark.parametrize("split", range(1, len(_RAW)))
+def test_writer_result_does_not_depend_on_chunk_boundary(split: int) -> None:
+    """行の途中・見出し記号の直後・連続する改行の間など、どこで区切られても結果は同じ"""
+    assert _write([_RAW[:split], _RAW[split:]]) == _EXPLANATION_HEADER + _EXPECTED
+
+
+def test_writer_with_one_character_chunks_and_empty_chunks() -> None:
+    """1文字ずつ・空の断片を挟んで届いても結果は同じ"""
+    chunks = [piece for char in _RAW for piece in (char, "")]
+    assert _write(chunks) == _EXPLANATION_HEADER + _EXPECTED
+
+
+def test_writer_without_trailing_newline() -> None:
+    """改行で終わらない最後の行も書き込む"""
+    assert _write(["# 見出", "し\n本", "文"]) == _EXPLANATION_HEADER + "## 見出し\n本文"
@@ -0,0 +1,67 @@
+"""CLIインターフェースのテスト"""
+
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from click.testing import CliRunner
+
+pytest.importorskip("google.genai")
+
+from learnpod import cli  # noqa: E402
+from learnpod.pipeline import orchestrator  # noqa: E402
+
+
+class _FakeOrchestrator:
+    """run_full_pipeline に渡された引数を記録するパイプラインの代替"""
+    
+    calls: List[Dict[str, object]] = []
+    
+    def run_full_pipeline(self, **kwargs) -> Path:
+        _FakeOrchestrator.calls.append(kwargs)
+        return Path("outputs/test")
+
+
+@pytest.fixture
+def run_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """パイプラインを差し替えて run コマンドを実行する関数"""
+    monkeypatch.setattr(orchestrator, "PipelineOrchestrator", _FakeOrchestrator)
+    monkeypatch.setattr(_FakeOrchestrator, "calls", [])
+    input_file = tmp_path / "input.md"
+    input_file.write_text("# タイトル\n", encoding="utf-8")
+    
+    def invoke(*args: str):
+        return CliRunner().invoke(cli.main, ["run", str(input_file), "--no-email", *args])
+    
+    return invoke
+
+
+def test_run_parses_speakers_and_voices(run_cli) -> None:
+    """カンマ区切りの "名前=値" を辞書に変換してパイプラインに渡す"""
+    result = run_cli("--speakers", "A=x, B = y", "--voices", "A=Zephyr,B=Puck")
+    
+    assert result.exit_code == 0, result.output
+    (call,) = _FakeOrchestrator.calls
+    assert call["speakers"] == {"A": "x", "B": "y"}
+    assert call["voice_map"] == {"A": "Zephyr", "B": "Puck"}
+    assert call["send_mail"] is False
+
+
+def test_run_rejects_pair_without_equals(run_cli) -> None:
+    """区切りの "=" を含まない組は使用方法のエラーとし、パイプラインを実行しない"""
+    result = run_cli("--speakers", "A=x,B")
+    
+    assert result.exit_code == 2
+    assert "--speakers" in result.output
+    assert "B" in result.output
+    assert _FakeOrchestrator.calls == []
+
+
+def test_run_uses_default_speakers_and_voices(run_cli) -> None:
+    """指定しない場合は既定のスピーカー・音声設定を辞書に変換して渡す"""
+    result = run_cli()
+    
+    assert result.exit_code == 0, result.output
+    (call,) = _FakeOrchestrator.calls
+    assert call["speakers"] == {"Speaker 1": "Sakura", "Speaker 2": "Taro"}
+    assert call["voice_map"] == {"Speaker 1": "Zephyr", "Speaker 2": "Puck"}
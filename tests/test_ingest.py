@@ -0,0 +1,91 @@
+"""Markdown取り込みモジュールのテスト"""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("yaml")
+
+from learnpod.pipeline import ingest  # noqa: E402
+from learnpod.pipeline.ingest import ingest_markdown  # noqa: E402
+
+
+def _write_md(tmp_path: Path, content: str, name: str = "doc.md") -> Path:
+    path = tmp_path / name
+    path.write_bytes(content.encode("utf-8"))
+    return path
+
+
+def test_front_matter_is_sliced_off_at_body_start(tmp_path: Path) -> None:
+    """YAML Front-Matterは取り込み時の位置で切り出し、正規表現での除去と同じ結果になる"""
+    front_matter = "---\ntitle: メタデータのタイトル\ntags: [a, b]\n---\n"
+    content = front_matter + "\n# 見出し\n本文\n"
+    
+    doc = ingest_markdown(_write_md(tmp_path, content))
+    
+    assert doc.metadata == {"title": "メタデータのタイトル", "tags": ["a", "b"]}
+    assert doc.title == "メタデータのタイトル"
+    assert doc.body_start == len(front_matter)
+    assert doc.content_without_metadata == "# 見出し\n本文"
+    assert doc.content_without_metadata == ingest._FRONT_MATTER_RE.sub("", content).strip()
+
+
+def test_content_without_front_matter_is_unchanged(tmp_path: Path) -> None:
+    """Front-Matterのない文書はそのまま返す"""
+    content = "# 見出し\n本文\n"
+    
+    doc = ingest_markdown(_write_md(tmp_path, content))
+    
+    assert doc.metadata is None
+    assert doc.content_without_metadata == content
+
+
+def test_title_crossing_search_boundary_is_not_truncated(tmp_path: Path) -> None:
+    """探索範囲の境界をまたぐH1見出しも全体を取得する"""
+    # "# タ" までが探索範囲に入り、残りは範囲外になる位置に見出しを置く
+    prefix = "a" * (ingest._TITLE_SEARCH_CHARS - 4) + "\n"
+    content = prefix + "# タイトルの続き\n本文\n"
+    assert content[ingest._TITLE_SEARCH_CHARS - 1] == "タ"
+    
+    assert ingest._extract_title(content, None, Path("doc.md")) == "タイトルの続き"
+
+
+def test_title_after_search_boundary_falls_back_to_full_search() -> None:
+    """探索範囲にH1見出しがない場合は全体から探す"""
+    content = "a" * ingest._TITLE_SEARCH_CHARS + "\n# 後ろのタイトル\n"
+    
+    assert ingest._extract_title(content, None, Path("doc.md")) == "後ろのタイトル"
+
+
+def test_crlf_headings() -> None:
+    """CRLF改行の見出しもタイトルと本文から改行コードを除いて抽出する"""
+    content = "# 見出し1\r\n本文1\r\n\r\n## 見出し2\r\n本文2\r\n"
+    
+    sections = ingest._extract_sections(content)
+    
+    assert sections == [
+        {"level": 1, "title": "見出し1", "content": "本文1"},
+        {"level": 2, "title": "見出し2", "content": "本文2"},
+    ]
+    assert ingest._extract_title(content, None, Path("doc.md")) == "見出し1"
+
+
+def test_crlf_file_is_read_with_universal_newlines(tmp_path: Path) -> None:
+    """CRLF改行のファイルは改行を統一して取り込む"""
+    doc = ingest_markdown(_write_md(tmp_path, "# 見出し1\r\n本文1\r\n### 見出し3\r\n本文3\r\n"))
+    
+    assert "\r" not in doc.raw_md
+    assert [(s["level"], s["title"], s["content"]) for s in doc.sections] == [
+        (1, "見出し1", "本文1"),
+        (3, "見出し3", "本文3"),
+    ]
+
+
+def test_document_without_headings(tmp_path: Path) -> None:
+    """見出しのない文書は全体を1つのセクションとし、ファイル名をタイトルにする"""
+    content = "見出しのない文書です。\n#タグ は見出しではない\n#### H4も対象外\n"
+    
+    doc = ingest_markdown(_write_md(tmp_path, content, name="notes.md"))
+    
+    assert doc.title == "notes"
+    assert doc.sections == [{"level": 1, "title": "本文", "content": content}]
@@ -0,0 +1,49 @@
+"""LLMレスポンスキャッシュモジュールのテスト"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from learnpod.utils.llm_cache import LLMCache  # noqa: E402
+
+
+def test_get_returns_saved_text_and_misses_unknown_key(tmp_path: Path) -> None:
+    """保存したキーはヒットし、未保存のキーはNoneになる"""
+    cache = LLMCache(tmp_path / "llm", ttl=3600)
+    key = LLMCache.make_key("model", 0.7, "プロンプト")
+    
+    assert cache.get(key) is None
+    
+    cache.set(key, "生成結果")
+    
+    assert cache.get(key) == "生成結果"
+    assert cache.get(LLMCache.make_key("model", 0.3, "プロンプト")) is None
+
+
+def test_get_ignores_entry_older_than_ttl(tmp_path: Path) -> None:
+    """更新日時が有効期限より古いキャッシュは使わない"""
+    cache = LLMCache(tmp_path / "llm", ttl=60)
+    key = LLMCache.make_key("model", 0.7, "プロンプト")
+    cache.set(key, "生成結果")
+    
+    expired = time.time() - 120
+    os.utime(cache._path(key), (expired, expired))
+    
+    assert cache.get(key) is None
+
+
+def test_disabled_cache_neither_reads_nor_writes(tmp_path: Path) -> None:
+    """無効化したキャッシュはファイルを作らず、既存のファイルも読まない"""
+    cache_dir = tmp_path / "llm"
+    key = LLMCache.make_key("model", 0.7, "プロンプト")
+    LLMCache(cache_dir, ttl=3600).set(key, "生成結果")
+    
+    disabled = LLMCache(cache_dir, ttl=3600, enabled=False)
+    disabled.set(LLMCache.make_key("model", 0.7, "別のプロンプト"), "別の結果")
+    
+    assert disabled.get(key) is None
+    assert [path.name for path in cache_dir.iterdir()] == [f"{key}.txt"]
@@ -0,0 +1,100 @@
+"""パイプライン統括モジュールのテスト"""
+
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from learnpod.generator import _client  # noqa: E402
+from learnpod.pipeline import orchestrator  # noqa: E402
+
+
+class _FakeAio:
+    """最初に使われたイベントループに接続が紐づく非同期クライアントの代替"""
+    
+    def __init__(self) -> None:
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closed = False
+    
+    async def request(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            # 実際の接続プールと同様、終了済みのループの接続は使えない
+            raise RuntimeError("Event loop is closed")
+        if self.closed:
+            raise RuntimeError("Client is closed")
+    
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class _FakeGenaiClient:
+    """genai.Client の代替"""
+    
+    instances: List["_FakeGenaiClient"] = []
+    
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.aio = _FakeAio()
+        _FakeGenaiClient.instances.append(self)
+
+
+def _fake_build_script(doc, output_dir: Path, **kwargs) -> Path:
+    script_path = output_dir / "script.md"
+    script_path.write_text("Speaker 1: こんにちは\n", encoding="utf-8")
+    return script_path
+
+
+async def _fake_build_explainer_async(script_path: Path, output_dir: Path, **kwargs) -> Path:
+    await _client.get_genai_client("test-key").aio.request()
+    explanation_path = output_dir / "explanation.md"
+    explanation_path.write_text("# 解説\n", encoding="utf-8")
+    return explanation_path
+
+
+async def _fake_build_questions_async(script_path: Path, output_dir: Path, **kwargs):
+    await _client.get_genai_client("test-key").aio.request()
+    qa_path = output_dir / "questions.md"
+    qa_path.write_text("# Q&A\n", encoding="utf-8")
+    return qa_path, None
+
+
+async def _fake_build_audio_async(script_path: Path, output_dir: Path, **kwargs):
+    await _client.get_genai_client("test-key").aio.request()
+    return None
+
+
+def test_run_full_pipeline_twice_uses_a_client_per_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """同じプロセスで2回実行しても前回のイベントループの接続を再利用しない"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(_client.genai, "Client", _FakeGenaiClient)
+    monkeypatch.setattr(_FakeGenaiClient, "instances", [])
+    monkeypatch.setattr(orchestrator, "build_script", _fake_build_script)
+    monkeypatch.setattr(orchestrator, "build_explainer_async", _fake_build_explainer_async)
+    monkeypatch.setattr(orchestrator, "build_questions_async", _fake_build_questions_async)
+    monkeypatch.setattr(orchestrator, "build_audio_async", _fake_build_audio_async)
+    
+    input_file = tmp_path / "input.md"
+    input_file.write_text("# タイトル\n\n本文\n", encoding="utf-8")
+    
+    for timestamp in ("run1", "run2"):
+        output_dir = orchestrator.PipelineOrchestrator().run_full_pipeline(
+            input_file=input_file,
+            send_mail=False,
+            timestamp=timestamp,
+        )
+        assert (output_dir / "explanation.md").exists()
+        assert (output_dir / "questions.md").exists()
+    
+    # 実行ごとに別のクライアントが作られ、ループの終了前に閉じられている
+    clients = _FakeGenaiClient.instances
+    assert len(clients) == 2
+    assert clients[0].aio.loop is not clients[1].aio.loop
+    assert all(client.aio.closed for client in clients)
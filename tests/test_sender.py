@@ -0,0 +1,164 @@
+"""メール送信モジュールのテスト"""
+
+import smtplib
+from email.mime.multipart import MIMEMultipart
+from pathlib import Path
+from typing import List
+
+import pytest
+
+yaml = pytest.importorskip("yaml")
+
+from learnpod.email import sender  # noqa: E402
+
+
+def _dump(cards) -> bytes:
+    return yaml.dump(
+        {"flashcards": cards}, allow_unicode=True, default_flow_style=False
+    ).encode("utf-8")
+
+
+def test_flashcard_count_from_prompt_format() -> None:
+    """プロンプトで指定した "  - id:" 形式は行数で数え、他のインデントのidは数えない"""
+    content = """flashcards:
+  - id: kw01
+    front: "問題1"
+    back: |
+      回答1
+      id: 回答中の行
+    category: "keyword"
+    
+  - id: kw02
+    front: "問題2"
+    back: "回答2"
+    category: "keyword"
+"""
+    assert sender._get_flashcard_count(content.encode("utf-8")) == 2
+
+
+def test_flashcard_count_falls_back_to_yaml_for_dumped_format() -> None:
+    """yaml.dump の出力（キーがソートされ "- back:" で始まる）はYAMLを解析して数える"""
+    cards = [
+        {"id": f"keyword_{i:02d}", "front": f"問題{i}", "back": f"回答{i}", "category": "keyword"}
+        for i in range(1, 4)
+    ]
+    assert sender._count_flashcard_ids(_dump(cards).decode("utf-8")) == 0
+    assert sender._get_flashcard_count(_dump(cards)) == 3
+
+
+def test_flashcard_count_falls_back_to_yaml_when_entries_lack_id_first() -> None:
+    """idで始まらない要素が混ざる場合は行数を使わずYAMLを解析する"""
+    content = """flashcards:
+  - id: kw01
+    front: "問題1"
+  - front: "問題2"
+    id: kw02
+  - id: kw03
+    front: "問題3"
+"""
+    assert sender._count_flashcard_ids(content) == 0
+    assert sender._get_flashcard_count(content.encode("utf-8")) == 3
+
+
+def test_flashcard_count_of_flow_style() -> None:
+    """フロー形式もYAMLを解析して数える"""
+    content = "flashcards: [{id: a, front: q1}, {id: b, front: q2}]\n"
+    assert sender._get_flashcard_count(content.encode("utf-8")) == 2
+
+
+class _FakeSMTP:
+    """ログイン回数と送信したメッセージを記録するSMTP_SSLの代替"""
+    
+    instances: List["_FakeSMTP"] = []
+    
+    def __init__(self, host: str, port: int) -> None:
+        self.logins = 0
+        self.sent: List[MIMEMultipart] = []
+        self.quit_called = False
+        self.closed = False
+        _FakeSMTP.instances.append(self)
+    
+    def login(self, user: str, password: str) -> None:
+        self.logins += 1
+        if password == "wrong":
+            raise smtplib.SMTPAuthenticationError(535, b"authentication failed")
+    
+    def send_message(self, msg: MIMEMultipart) -> None:
+        self.sent.append(msg)
+    
+    def quit(self) -> None:
+        self.quit_called = True
+    
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch: pytest.MonkeyPatch):
+    """SMTP_SSLを差し替え、Gmail設定を埋める"""
+    monkeypatch.setattr(sender.smtplib, "SMTP_SSL", _FakeSMTP)
+    monkeypatch.setattr(_FakeSMTP, "instances", [])
+    for name, value in (
+        ("gmail_user", "user@example.com"),
+        ("gmail_password", "password"),
+        ("gmail_to", "to@example.com"),
+        ("has_gmail_config", True),
+    ):
+        monkeypatch.setattr(sender.config, name, value, raising=False)
+    return _FakeSMTP
+
+
+def test_session_logs_in_once_for_several_emails(fake_smtp, tmp_path: Path) -> None:
+    """開始済みのセッションを渡した送信は1回の接続・ログインで行われる"""
+    script_path = tmp_path / "script.md"
+    script_path.write_text("Speaker 1: こんにちは\n", encoding="utf-8")
+    
+    with sender.SMTPSession() as session:
+        for i in range(3):
+            assert sender.send_email(
+                output_dir=tmp_path,
+                title=f"タイトル{i}",
+                script_path=script_path,
+                session=session,
+            )
+    
+    assert len(fake_smtp.instances) == 1
+    server = fake_smtp.instances[0]
+    assert server.logins == 1
+    assert [msg["Subject"] for msg in server.sent] == [
+        "LearnPod: タイトル0",
+        "LearnPod: タイトル1",
+        "LearnPod: タイトル2",
+    ]
+    assert server.quit_called
+    assert session.server is None
+
+
+def test_session_closes_connection_when_login_fails(
+    fake_smtp, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """ログインに失敗した場合は接続を閉じて例外を送出する"""
+    monkeypatch.setattr(sender.config, "gmail_password", "wrong", raising=False)
+    session = sender.SMTPSession()
+    
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        with session:
+            pytest.fail("ログイン失敗時にwith文の本体は実行されない")
+    
+    assert fake_smtp.instances[0].closed
+    assert session.server is None
+
+
+def test_send_message_outside_with_raises(fake_smtp) -> None:
+    """with文で開始していない・終了したセッションでは送信できない"""
+    session = sender.SMTPSession()
+    
+    with pytest.raises(RuntimeError):
+        session.send_message(MIMEMultipart())
+    
+    with session:
+        session.send_message(MIMEMultipart())
+    
+    with pytest.raises(RuntimeError):
+        session.send_message(MIMEMultipart())
+    assert len(fake_smtp.instances[0].sent) == 1
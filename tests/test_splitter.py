@@ -0,0 +1,62 @@
+"""テキスト分割モジュールのテスト"""
+
+import re
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from learnpod.generator.llm_client import LLMClient  # noqa: E402
+from learnpod.generator.splitter import TextSplitter, _estimate_tokens  # noqa: E402
+
+# 分割の基準となる元の実装（空白文字だけの行を含む空行で分割）
+_PARA_RE = re.compile(r'\n\s*\n')
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a\n\nb",
+        "a\n\n\nb",
+        "a\n \nb",
+        "a\n\u3000\nb",
+        "a\n\u2003\nb",
+        "a\n\x85\nb",
+        "a\n\u2028\nb",
+        "a\n\x1c\nb",
+        "a\n\r\n\r\nb",
+        "a\n b\n\nc",
+    ],
+)
+def test_split_by_paragraphs_matches_blank_line_regex(text: str) -> None:
+    """空白文字だけの行も正規表現での分割と同じく段落の区切りとして扱う"""
+    expected = [p.strip() for p in _PARA_RE.split(text) if p.strip()]
+    assert TextSplitter(chunk_size=800)._split_by_paragraphs(text) == expected
+
+
+class _FakeLLMClient:
+    """1文字を1トークンとして数えるLLMクライアントの代替（概算の0.7倍より多い）"""
+    
+    is_token_limit_exceeded = LLMClient.is_token_limit_exceeded
+    
+    def count_tokens(self, text: str) -> int:
+        return len(text)
+
+
+def test_split_by_tokens_keeps_every_chunk_within_real_token_count() -> None:
+    """概算が実際のトークン数を下回る日本語でも、確定したチャンクは制限内に収まる"""
+    sentence = "これは分割のテストに使う文です。"
+    paragraphs = [sentence * n for n in (6, 3, 7, 2, 5, 6)]
+    text = "\n\n".join(paragraphs)
+    splitter = TextSplitter(chunk_size=100)
+    llm_client = _FakeLLMClient()
+    
+    # 概算では制限内でも、実際のトークン数では制限を超える段落がある
+    longest = max(paragraphs, key=len)
+    assert _estimate_tokens(longest) <= splitter.chunk_size < llm_client.count_tokens(longest)
+    
+    chunks = splitter.split_by_tokens(text, llm_client)
+    
+    assert len(chunks) > 1
+    assert all(llm_client.count_tokens(chunk) <= splitter.chunk_size for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
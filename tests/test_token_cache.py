@@ -0,0 +1,70 @@
+"""トークン数キャッシュモジュールのテスト"""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from learnpod.generator.token_cache import TokenCache, content_hash  # noqa: E402
+
+
+class _Counter:
+    """呼び出されたテキストを記録するトークンカウンター"""
+    
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+    
+    def __call__(self, text: str) -> int:
+        self.calls.append(text)
+        return len(text)
+
+
+def test_count_tokens_calls_counter_only_on_miss(tmp_path: Path) -> None:
+    """同じテキストとモデルの2回目はカウンターを呼ばず、モデルが異なればカウントし直す"""
+    cache = TokenCache(tmp_path / "tokens.sqlite")
+    counter = _Counter()
+    
+    assert cache.get(content_hash("本文"), "model-a") is None
+    assert cache.count_tokens("本文", "model-a", counter) == 2
+    assert cache.count_tokens("本文", "model-a", counter) == 2
+    assert cache.count_tokens("本文", "model-b", counter) == 2
+    
+    assert counter.calls == ["本文", "本文"]
+
+
+def test_counter_failure_is_not_cached(tmp_path: Path) -> None:
+    """カウンターの例外はそのまま送出し、失敗結果はキャッシュしない"""
+    cache = TokenCache(tmp_path / "tokens.sqlite")
+    
+    def failing_counter(text: str) -> int:
+        raise RuntimeError("API error")
+    
+    with pytest.raises(RuntimeError):
+        cache.count_tokens("本文", "model-a", failing_counter)
+    assert cache.get(content_hash("本文"), "model-a") is None
+
+
+def test_sqlite_entry_is_used_by_fresh_instance(tmp_path: Path) -> None:
+    """SQLiteに保存したトークン数は新しいインスタンスからも参照できる"""
+    db_path = tmp_path / "tokens.sqlite"
+    TokenCache(db_path).count_tokens("本文", "model-a", _Counter())
+    
+    counter = _Counter()
+    fresh = TokenCache(db_path)
+    
+    assert fresh.count_tokens("本文", "model-a", counter) == 2
+    assert counter.calls == []
+
+
+def test_memory_only_cache_without_db_path() -> None:
+    """db_pathを指定しない場合はプロセス内のメモリにのみ保持する"""
+    cache = TokenCache()
+    counter = _Counter()
+    
+    cache.count_tokens("本文", "model-a", counter)
+    cache.count_tokens("本文", "model-a", counter)
+    
+    assert counter.calls == ["本文"]
+    assert TokenCache().get(content_hash("本文"), "model-a") is None